@@ -1,14 +1,13 @@
+import sys
 import pandas as pd
 import difflib
-import unicodedata
-import re
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from src.normalizacao import normalizar as _normalizar
 
 def normalizar(texto):
-    texto = unicodedata.normalize('NFD', texto)
-    texto = texto.encode('ascii', 'ignore').decode('utf-8')
-    texto = texto.lower()
-    texto = re.sub(r'\s+', ' ', texto).strip()
-    return texto
+    return _normalizar(texto, caixa="lower")
 
 def similaridade_percentual(str1, str2):
     n1 = normalizar(str1)
@@ -21,16 +20,21 @@ corrigidos = ['NONOAI', 'TRISTEZA', 'SARANDI', 'SANTA ROSA DE LIMA', 'MORRO SANT
 def main():
     df = pd.read_csv('remanescentes.csv')
 
+    # normalize the reference list once; each distinct bairro is scored once
+    corrigidos_norm = [(normalizar(corr), corr) for corr in corrigidos]
+    mapa = {}
+
     with open('scores.txt', 'w', encoding='utf-8') as f:  # abre uma vez só
-        for idx, row in df.iterrows():
+        for bairro in df['Bairro'].dropna().unique():
 
-            if not isinstance(row['Bairro'], str):
+            if not isinstance(bairro, str):
                 continue
 
+            n_bairro = normalizar(bairro)
             probs = []
 
-            for corr in corrigidos:
-                score = similaridade_percentual(row['Bairro'], corr)
+            for n_corr, corr in corrigidos_norm:
+                score = difflib.SequenceMatcher(None, n_bairro, n_corr).ratio() * 100
                 probs.append((score, corr))
 
             # ordena do maior para o menor
@@ -39,14 +43,15 @@ def main():
             best_score, best_corr = probs_ordenado[0]
 
             if best_score >= 70:
-                df.at[idx, 'Bairro'] = best_corr 
-                msg = f'Sucesso: {row["Bairro"]} ~= {best_corr} ({best_score:.2f}%)'
+                mapa[bairro] = best_corr
+                msg = f'Sucesso: {bairro} ~= {best_corr} ({best_score:.2f}%)'
             else:
-                msg = f'Score insuficiente: {row["Bairro"]} != {best_corr} ({best_score:.2f}%)'
+                msg = f'Score insuficiente: {bairro} != {best_corr} ({best_score:.2f}%)'
 
             print(msg)
             f.write(msg + '\n')
 
+    df['Bairro'] = df['Bairro'].replace(mapa)
 
     df.to_csv('resultadoPadronizacao.csv', index=False)
 
@@ -1,15 +1,48 @@
+import sys
 import pandas as pd
+from pathlib import Path
 
-# Ler arquivos
-df_csv = pd.read_csv("PortoAlegre_total/violencia_total.csv")
-df_xlsx = pd.read_excel("PortoAlegre_total/dadosViolenciaPadronizados.xlsx")
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.ingestao import read_workbook
+from src.dedup import load_fingerprints, save_fingerprints, split_new
 
-# Juntar as linhas (empilhar um abaixo do outro)
-df_final = pd.concat([df_csv, df_xlsx], ignore_index=True)
+SAIDA = Path("resultado.csv")
+# fingerprints of every row already in resultado.csv (see src/dedup.py)
+INDICE = Path("resultado.fingerprints.npy")
+RELATORIO = Path("duplicatas.csv")
 
-# Salvar resultado
-df_final.to_csv("resultado.csv", index=False)
-# ou salvar em Excel
-# df_final.to_excel("resultado.xlsx", index=False)
+# Ler arquivos (a planilha só é reprocessada quando o conteúdo muda)
+fontes = {
+    "violencia_total.csv": pd.read_csv("PortoAlegre_total/violencia_total.csv"),
+    "dadosViolenciaPadronizados.xlsx": read_workbook("PortoAlegre_total/dadosViolenciaPadronizados.xlsx"),
+}
 
-print("Arquivos unidos com sucesso!")
+# sem resultado.csv o índice não vale mais, e sem índice (resultado.csv do
+# script antigo, que só concatenava) não há como saber o que já entrou:
+# nos dois casos o arquivo é refeito do zero a partir das fontes
+refazer = not SAIDA.exists() or not INDICE.exists()
+if refazer:
+    INDICE.unlink(missing_ok=True)
+conhecidos = load_fingerprints(INDICE)
+colunas = None if refazer else list(pd.read_csv(SAIDA, nrows=0).columns)
+
+novos, relatorio = [], []
+for nome, df in fontes.items():
+    df_novo, conhecidos, clusters = split_new(df, conhecidos)
+    novos.append(df_novo)
+    relatorio.append(clusters.assign(fonte=nome))
+    print(f"{nome}: {len(df)} linhas, {len(df_novo)} novas, {len(df) - len(df_novo)} duplicadas "
+          f"({len(clusters)} grupos)")
+
+# Juntar só as linhas inéditas (empilhar um abaixo do outro)
+df_novos = pd.concat([d for d in novos if not d.empty] or novos[:1], ignore_index=True)
+if colunas is not None and set(df_novos.columns) <= set(colunas):
+    df_novos.reindex(columns=colunas).to_csv(SAIDA, mode="a", header=False, index=False)
+else:
+    # colunas novas: reescreve o arquivo inteiro com o cabeçalho ampliado
+    anterior = [pd.read_csv(SAIDA)] if colunas is not None else []
+    pd.concat(anterior + [df_novos], ignore_index=True).to_csv(SAIDA, index=False)
+save_fingerprints(INDICE, conhecidos)
+
+pd.concat(relatorio, ignore_index=True).to_csv(RELATORIO, index=False)
+print(f"Arquivos unidos com sucesso! {len(df_novos)} linhas novas em {SAIDA}; grupos de duplicatas em {RELATORIO}")
@@ -0,0 +1,157 @@
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import disk_cache
+from src.schema import FACT_TABLES, check_db_schema, validate_frame
+
+# Shared data layer: loading and the filtered aggregates behind each
+# dashboard panel. No Streamlit here, so the headless API and any batch job
+# compute exactly the same numbers as `app.py`. Tables already follow the
+# contract in src/schema.py, so nothing is renamed or re-typed here.
+
+HEAT_AXES = ["BAIRRO", "TIPOVIOLENCIA", "COR_PELE"]
+
+def read_table(db_path: str, table_name: str) -> pd.DataFrame:
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"DB não encontrado: {db_path}")
+    conn = sqlite3.connect(db_path)
+    try:
+        df = pd.read_sql(f"SELECT * FROM {table_name}", conn)
+    finally:
+        conn.close()
+    return df
+
+def table_columns(db_path: str, table_name: str) -> list:
+    conn = sqlite3.connect(db_path)
+    try:
+        return [row[1] for row in conn.execute(f'PRAGMA table_info("{table_name}")')]
+    finally:
+        conn.close()
+
+def dataset_version(db_path: str) -> str:
+    """Identifica a versão do DB (muda sempre que o ETL reescreve o arquivo)."""
+    st_db = Path(db_path).stat()
+    return f"{st_db.st_mtime_ns:x}-{st_db.st_size:x}"
+
+def _read_checked(db_path: str):
+    check_db_schema(db_path)
+    tables = []
+    for table in FACT_TABLES:
+        df = read_table(db_path, table)
+        validate_frame(df, table)
+        tables.append(df)
+    return tuple(tables)
+
+def load_city_tables(db_path: str):
+    """(categorias, heatmap, histograma) conforme o contrato, via cache compartilhado se ativo."""
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"DB não encontrado: {db_path}")
+    return disk_cache.cached(
+        "tabelas", dataset_version(db_path), {"db": str(Path(db_path).resolve())},
+        lambda: _read_checked(db_path),
+    )
+
+def read_catalog(db_path: str) -> pd.DataFrame:
+    """Tabela `catalogo` (opções e ordem de cada dimensão), sem ler as tabelas de fatos."""
+    check_db_schema(db_path)
+    catalogo = read_table(db_path, "catalogo")
+    validate_frame(catalogo, "catalogo")
+    return catalogo
+
+# -----------------------
+# OPÇÕES (a partir do catálogo)
+# -----------------------
+def catalog_options(catalogo: pd.DataFrame, n: int = 5) -> dict:
+    """{"anos": [...], dimensão: {"valores": [...], "top": [...]}}, pronto para os widgets.
+
+    Calculado uma vez por versão do DB; montar a barra lateral vira só consulta a dict.
+    """
+    opcoes = {"anos": sorted(int(a) for a in catalogo["ANOFATO"].unique())}
+    ranks = catalogo[["dimensao", "valor", "posicao"]].drop_duplicates()
+    for dim, grupo in ranks.groupby("dimensao", sort=False):
+        opcoes[dim] = {"valores": sorted(grupo["valor"]), "top": list(grupo.sort_values("posicao")["valor"][:n])}
+    return opcoes
+
+def default_filters(opcoes: dict) -> dict:
+    """Mesmos padrões da barra lateral: último ano, top 5 bairros/cores, todos os tipos."""
+    anos = opcoes["anos"]
+    return {
+        "anos": [max(anos)] if anos else [],
+        "bairros": opcoes["BAIRRO"]["top"],
+        "cores": opcoes["COR_PELE"]["top"],
+        "tipos": opcoes["TIPOVIOLENCIA"]["valores"],
+    }
+
+# -----------------------
+# FILTROS E AGREGADOS
+# -----------------------
+
+def category_filters(anos, tipos=None, cores=None, bairros=None) -> dict:
+    """Filtros da barra lateral por coluna; None não restringe (anos sempre restringe)."""
+    return {"ANOFATO": list(anos), "TIPOVIOLENCIA": tipos or None,
+            "COR_PELE": cores or None, "BAIRRO": bairros or None}
+
+def filter_categorias(cat_full: pd.DataFrame, anos, tipos=None, cores=None, bairros=None, index=None) -> pd.DataFrame:
+    filtros = category_filters(anos, tipos, cores, bairros)
+    # with a BitmapIndex (src/bitmaps.py) over cat_full this is bitwise ops only
+    if index is not None:
+        return index.take(cat_full, index.match(filtros))
+    cat_df = cat_full
+    for col, values in filtros.items():
+        if values is not None:
+            cat_df = cat_df[cat_df[col].isin(values)]
+    return cat_df
+
+def category_totals(cat_df: pd.DataFrame, col: str) -> pd.DataFrame:
+    return cat_df.groupby(col)["Quantidade"].sum().reset_index()
+
+def bairro_totals(cat_df: pd.DataFrame) -> pd.DataFrame:
+    return category_totals(cat_df, "BAIRRO").sort_values("Quantidade", ascending=False, ignore_index=True)
+
+def heatmap_slice(heat_full: pd.DataFrame, anos, eixo_x: str, eixo_y: str, bairros=None) -> pd.DataFrame:
+    heat_df = heat_full[heat_full["ANOFATO"].isin(anos)
+                        & (heat_full["EixoX"] == eixo_x) & (heat_full["EixoY"] == eixo_y)]
+
+    # If user selected bairros filter, apply it to heat via X_val/Y_val when axis is BAIRRO
+    if bairros and eixo_x == "BAIRRO":
+        heat_df = heat_df[heat_df["X_val"].isin(bairros)]
+    if bairros and eixo_y == "BAIRRO":
+        heat_df = heat_df[heat_df["Y_val"].isin(bairros)]
+    return heat_df
+
+def heatmap_from_categorias(cat_df: pd.DataFrame, eixo_x: str, eixo_y: str) -> pd.DataFrame:
+    """Mesmo formato de `heatmap_slice`, somado a partir de linhas (já filtradas) de categorias."""
+    if eixo_x == eixo_y:
+        return pd.DataFrame(columns=["X_val", "Y_val", "Quantidade"])
+    df_h = cat_df.groupby([eixo_x, eixo_y])["Quantidade"].sum().reset_index()
+    return df_h.rename(columns={eixo_x: "X_val", eixo_y: "Y_val"})
+
+def heatmap_matrix(df_h: pd.DataFrame, top_n: int = 5):
+    """Matriz Y_val × X_val (z, x, y) restrita ao top-N de cada eixo; None se não houver dados.
+
+    Eixos em ordem crescente, como um pivot_table; a matriz sai de um único
+    np.bincount sobre os códigos das células, sem pivot.
+    """
+    top_x = df_h.groupby("X_val")["Quantidade"].sum().nlargest(top_n).index
+    top_y = df_h.groupby("Y_val")["Quantidade"].sum().nlargest(top_n).index
+    df_h = df_h[df_h["X_val"].isin(top_x) & df_h["Y_val"].isin(top_y)]
+    if df_h.empty:
+        return None
+    x = np.sort(df_h["X_val"].unique())
+    y = np.sort(df_h["Y_val"].unique())
+    celulas = np.searchsorted(y, df_h["Y_val"].to_numpy()) * len(x) + np.searchsorted(x, df_h["X_val"].to_numpy())
+    z = np.bincount(celulas, weights=df_h["Quantidade"].to_numpy(dtype=float), minlength=len(x) * len(y))
+    return {"z": z.reshape(len(y), len(x)).astype(np.int64), "x": x.tolist(), "y": y.tolist()}
+
+def filter_hist(hist_full: pd.DataFrame, anos) -> pd.DataFrame:
+    return hist_full[hist_full["ANOFATO"].isin(anos)]
+
+def age_bins(hist_df: pd.DataFrame, nbins: int = 20) -> pd.DataFrame:
+    idades = hist_df["IDADE"].dropna().to_numpy()
+    if idades.size == 0:
+        return pd.DataFrame(columns=["inicio", "fim", "Quantidade"])
+    counts, edges = np.histogram(idades, bins=nbins)
+    return pd.DataFrame({"inicio": edges[:-1], "fim": edges[1:], "Quantidade": counts})
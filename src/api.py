@@ -0,0 +1,290 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import threading
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+import numpy as np
+import pandas as pd
+
+from src.config import CIDADES
+from src.export import signed_export
+from src.schema import TABLES
+from src import disk_cache
+from src.aggregations import (
+    load_city_tables, read_catalog, catalog_options, dataset_version,
+    HEAT_AXES, default_filters,
+    filter_categorias, category_totals, bairro_totals, heatmap_slice, heatmap_matrix,
+    filter_hist, age_bins,
+)
+
+# Headless JSON API with the same filtered aggregates main() shows.
+#
+#   python -m src.api --port 8502
+#   curl -H 'Accept-Encoding: gzip' 'localhost:8502/api/bh/categorias?grupo=BAIRRO&anos=2022'
+#
+# List filters are repeated query params (anos=2021&anos=2022); a missing
+# filter falls back to the sidebar default, an empty one (bairros=, anos=) disables it.
+# The ETag comes from the DB version and the canonical request alone, so a
+# matching If-None-Match gets its 304 before the city tables are even loaded.
+#
+# It also serves the dashboard's export files (/api/exportacoes/<arquivo>,
+# signed links from src/export.py), streamed from disk in chunks; the app
+# links to it through SOBREVIDA_API_URL.
+
+GZIP_MIN_BYTES = 512
+FILE_CHUNK_BYTES = 1024 * 1024
+_load_lock = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _load_city(db_path: str, version: str):
+    # version is part of the key so a rewritten DB is reloaded
+    return load_city_tables(db_path) + (catalog_options(read_catalog(db_path)),)
+
+
+@lru_cache(maxsize=8)
+def _load_options(db_path: str, version: str):
+    return catalog_options(read_catalog(db_path))
+
+
+def load_city(db_path: str):
+    version = dataset_version(db_path)
+    with _load_lock:
+        return version, _load_city(db_path, version)
+
+
+def load_options(db_path: str):
+    """(versão, opções do catálogo), sem ler as tabelas de fatos."""
+    version = dataset_version(db_path)
+    with _load_lock:
+        return version, _load_options(db_path, version)
+
+
+def _json_default(o):
+    if isinstance(o, np.integer):
+        return int(o)
+    if isinstance(o, np.floating):
+        return float(o)
+    if o is pd.NA or o is pd.NaT:
+        return None
+    raise TypeError(f"não serializável: {type(o)}")
+
+
+def _records(df: pd.DataFrame) -> list:
+    return json.loads(df.to_json(orient="records", force_ascii=False))
+
+
+def resolve_filters(query: dict, opcoes: dict) -> dict:
+    defaults = default_filters(opcoes)
+    filtros = {}
+    for nome in ("anos", "tipos", "cores", "bairros"):
+        valores = [v for v in query.get(nome, [None]) if v is not None]
+        if nome not in query:
+            valores = defaults[nome]
+        valores = [v for v in valores if v != ""]
+        if nome == "anos":
+            # the aggregates always restrict by year: "no filter" is every year
+            valores = [int(v) for v in valores] or opcoes["anos"]
+        else:
+            valores = [str(v).upper().strip() for v in valores]
+        filtros[nome] = sorted(valores)
+    return filtros
+
+
+def _one(query: dict, nome: str, default=None):
+    valores = query.get(nome)
+    return valores[0] if valores else default
+
+
+def resource_params(recurso: str, query: dict) -> dict:
+    """Parâmetros do recurso, com padrões e tipos; KeyError se o recurso não existe."""
+    if recurso in ("filtros", "bairros"):
+        return {}
+    if recurso == "categorias":
+        grupo = _one(query, "grupo", "TIPOVIOLENCIA")
+        if TABLES["categorias"].get(grupo) != "str":
+            raise ValueError(f"grupo inválido: {grupo}")
+        return {"grupo": grupo}
+    if recurso == "heatmap":
+        return {"eixo_x": _one(query, "eixo_x", HEAT_AXES[0]), "eixo_y": _one(query, "eixo_y", HEAT_AXES[1]),
+                "top": int(_one(query, "top", 5))}
+    if recurso == "idades":
+        return {"nbins": int(_one(query, "nbins", 20))}
+    raise KeyError(recurso)
+
+
+def canonical_request(cidade: dict, recurso: str, query: dict):
+    """(versão, filtros canônicos) do pedido, só com o catálogo: basta para o ETag."""
+    version, opcoes = load_options(cidade["db"])
+    return version, {**resolve_filters(query, opcoes), **resource_params(recurso, query)}
+
+
+def aggregate(cidade: dict, recurso: str, query: dict):
+    """Calcula o agregado pedido; devolve (versão, filtros canônicos, payload)."""
+    version, tables = load_city(cidade["db"])
+    filtros = resolve_filters(query, tables[3])
+    params = resource_params(recurso, query)
+    canonical = {**filtros, **params}
+    payload = disk_cache.cached(
+        f"api-{recurso}-payload", version, {"db": cidade["db"], **canonical},
+        lambda: _compute(tables, recurso, filtros, params),
+    )
+    return version, canonical, payload
+
+
+def _compute(tables, recurso: str, filtros: dict, params: dict):
+    cat_full, heat_full, hist_full, opcoes = tables
+    cat_df = filter_categorias(cat_full, filtros["anos"], filtros["tipos"], filtros["cores"], filtros["bairros"])
+
+    if recurso == "filtros":
+        return {
+            "anos": opcoes["anos"],
+            "eixos": HEAT_AXES,
+            "padrao": resolve_filters({}, opcoes),
+        }
+    if recurso == "categorias":
+        grupo = params["grupo"]
+        totais = category_totals(cat_df, grupo)
+        return {"grupo": grupo, "total": int(totais["Quantidade"].sum()), "itens": _records(totais)}
+    if recurso == "heatmap":
+        eixo_x, eixo_y = params["eixo_x"], params["eixo_y"]
+        df_h = heatmap_slice(heat_full, filtros["anos"], eixo_x, eixo_y, filtros["bairros"])
+        matriz = heatmap_matrix(df_h, top_n=params["top"]) if not df_h.empty else None
+        return {"eixo_x": eixo_x, "eixo_y": eixo_y,
+                "x": [] if matriz is None else matriz["x"],
+                "y": [] if matriz is None else matriz["y"],
+                "z": [] if matriz is None else matriz["z"].tolist()}
+    if recurso == "idades":
+        return {"bins": _records(age_bins(filter_hist(hist_full, filtros["anos"]), params["nbins"]))}
+    if recurso == "bairros":
+        totais = bairro_totals(cat_df)
+        return {"total": int(totais["Quantidade"].sum()), "itens": _records(totais)}
+    raise KeyError(recurso)
+
+
+def make_etag(slug: str, recurso: str, version: str, canonical: dict) -> str:
+    key = json.dumps([slug, recurso, version, canonical], sort_keys=True, default=_json_default)
+    return 'W/"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+class AggregateHandler(BaseHTTPRequestHandler):
+    cidades = CIDADES
+    server_version = "SobreVIDA-API/1"
+
+    def log_message(self, format, *args):
+        if getattr(self.server, "verbose", True):
+            super().log_message(format, *args)
+
+    def _send(self, status: int, payload=None, etag: str = None):
+        body = b""
+        if payload is not None:
+            body = json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+        self.send_response(status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if body:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            if len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(body, compresslevel=6)
+                self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _send_file(self, path, nome: str):
+        # streamed in chunks: only FILE_CHUNK_BYTES of the export are in memory at a time
+        with open(path, "rb") as f:
+            tamanho = os.fstat(f.fileno()).st_size
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv" if path.suffix == ".csv" else "application/octet-stream")
+            self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(nome)}")
+            self.send_header("Content-Length", str(tamanho))
+            self.end_headers()
+            shutil.copyfileobj(f, self.wfile, FILE_CHUNK_BYTES)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        partes = [p for p in url.path.split("/") if p]
+        if len(partes) == 3 and partes[:2] == ["api", "exportacoes"]:
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            try:
+                path = signed_export(partes[2], query.get("nome", ""), query.get("expira", ""),
+                                     query.get("assinatura", ""))
+            except PermissionError as e:
+                self._send(403, {"erro": str(e)})
+                return
+            except FileNotFoundError as e:
+                self._send(404, {"erro": str(e)})
+                return
+            self._send_file(path, query.get("nome") or path.name)
+            return
+        if partes == ["api", "cidades"]:
+            self._send(200, {slug: c["nome"] for slug, c in self.cidades.items()})
+            return
+        if len(partes) != 3 or partes[0] != "api" or partes[1] not in self.cidades:
+            self._send(404, {"erro": "rota não encontrada"})
+            return
+
+        slug, recurso = partes[1], partes[2]
+        query = parse_qs(url.query, keep_blank_values=True)
+        try:
+            # the ETag only needs the DB version and the canonical request, so a
+            # revalidation is answered before anything is aggregated
+            version, canonical = canonical_request(self.cidades[slug], recurso, query)
+            etag = make_etag(slug, recurso, version, canonical)
+            if etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+                self._send(304, etag=etag)
+                return
+            version, canonical, payload = aggregate(self.cidades[slug], recurso, query)
+        except KeyError:
+            self._send(404, {"erro": f"recurso desconhecido: {recurso}"})
+            return
+        except FileNotFoundError as e:
+            self._send(503, {"erro": str(e)})
+            return
+        except ValueError as e:
+            self._send(400, {"erro": str(e)})
+            return
+
+        etag = make_etag(slug, recurso, version, canonical)
+        self._send(200, {"cidade": slug, "versao": version, "filtros": canonical, **payload}, etag=etag)
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8502, cidades: dict = None, verbose: bool = True):
+    """Cria o servidor; `cidades` permite apontar para DBs de fixture."""
+    handler = type("Handler", (AggregateHandler,), {"cidades": cidades or CIDADES})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.verbose = verbose
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="API JSON dos agregados do dashboard")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--bh-db", help="sobrescreve o DB de Belo Horizonte")
+    parser.add_argument("--poa-db", help="sobrescreve o DB de Porto Alegre")
+    args = parser.parse_args()
+
+    cidades = {slug: dict(cfg) for slug, cfg in CIDADES.items()}
+    if args.bh_db:
+        cidades["bh"]["db"] = args.bh_db
+    if args.poa_db:
+        cidades["poa"]["db"] = args.poa_db
+    server = make_server(args.host, args.port, cidades)
+    print(f"API em http://{args.host}:{args.port}/api/cidades")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
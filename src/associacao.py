@@ -0,0 +1,54 @@
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from src.schema import TABLES
+
+# Association strength (Cramér's V) between every pair of categorias
+# dimensions.
+#
+# Each dimension is factorized once per dataset (`encode_dimensions`); a
+# contingency table for a pair is then a single weighted np.bincount over
+# the combined codes of the selected rows, and the expected counts are the
+# outer product of its margins. No pivot tables and no per-pair rereads.
+
+DIMENSOES = [col for col, tipo in TABLES["categorias"].items() if tipo == "str"]
+
+
+def encode_dimensions(cat_full: pd.DataFrame, dims=DIMENSOES) -> dict:
+    """Códigos (int) de cada dimensão e os pesos (Quantidade) de cada linha."""
+    codigos = {}
+    for col in dims:
+        codes, uniques = pd.factorize(cat_full[col])
+        codigos[col] = (codes.astype(np.int64), len(uniques))
+    return {"codigos": codigos, "pesos": cat_full["Quantidade"].to_numpy(dtype=float)}
+
+
+def contingency(a, ka: int, b, kb: int, pesos) -> np.ndarray:
+    return np.bincount(a * kb + b, weights=pesos, minlength=ka * kb).reshape(ka, kb)
+
+
+def cramers_v(tabela: np.ndarray) -> float:
+    tabela = tabela[tabela.sum(axis=1) > 0][:, tabela.sum(axis=0) > 0]
+    r, c = tabela.shape
+    n = tabela.sum()
+    if min(r, c) < 2 or n == 0:
+        return np.nan
+    esperado = np.outer(tabela.sum(axis=1), tabela.sum(axis=0)) / n
+    chi2 = ((tabela - esperado) ** 2 / esperado).sum()
+    return float(np.sqrt(chi2 / (n * (min(r, c) - 1))))
+
+
+def association_matrix(codificado: dict, linhas=None) -> pd.DataFrame:
+    """Matriz simétrica de V de Cramér; `linhas` são as posições selecionadas (None = todas)."""
+    pesos = codificado["pesos"] if linhas is None else codificado["pesos"][linhas]
+    codigos = {col: (codes if linhas is None else codes[linhas], k) for col, (codes, k) in codificado["codigos"].items()}
+    # dimensions with a single value in the selection carry no association
+    dims = [col for col, (codes, k) in codigos.items() if np.count_nonzero(np.bincount(codes, minlength=k)) > 1]
+
+    matriz = pd.DataFrame(np.eye(len(dims)), index=dims, columns=dims)
+    for x, y in combinations(dims, 2):
+        (a, ka), (b, kb) = codigos[x], codigos[y]
+        matriz.loc[x, y] = matriz.loc[y, x] = cramers_v(contingency(a, ka, b, kb, pesos))
+    return matriz
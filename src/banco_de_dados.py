@@ -1,7 +1,13 @@
+import sys
 import pandas as pd
 import numpy as np
 import sqlite3
 from itertools import product
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.normalizacao import normalizar_serie
+from src.schema import write_tables
 
 csv_path = "./PCMG/BH.csv"
 db_path = "violencia.db"
@@ -16,10 +22,10 @@ df = df.rename(columns={
 })
 
 df["DataFato"] = pd.to_datetime(df["DataFato"], errors="coerce")
-df["AnoFato"] = df["DataFato"].dt.year
+df["ANOFATO"] = df["DataFato"].dt.year
 
-df = df.dropna(subset=["AnoFato"])
-df["AnoFato"] = df["AnoFato"].astype(int)
+df = df.dropna(subset=["ANOFATO"])
+df["ANOFATO"] = df["ANOFATO"].astype(int)
 
 cat_cols = [
     "TIPOVIOLENCIA", "BAIRRO", "FaixaEtária", "Sexo",
@@ -27,6 +33,9 @@ cat_cols = [
     "TipoEnvolvimento", "GrauLesão"
 ]
 
+for col in ["TIPOVIOLENCIA", "BAIRRO", "COR_PELE"]:
+    df[col] = normalizar_serie(df[col])
+
 num_col = "IDADE"
 
 heat_records = []
@@ -34,7 +43,7 @@ heat_records = []
 for x, y in product(cat_cols, repeat=2):
     if x == y: 
         continue
-    temp = df.groupby([x, y, "AnoFato"]).size().reset_index(name="Quantidade")
+    temp = df.groupby([x, y, "ANOFATO"]).size().reset_index(name="Quantidade")
     temp["EixoX"] = x
     temp["EixoY"] = y
     temp = temp.rename(columns={x: "X_val", y: "Y_val"})
@@ -42,12 +51,10 @@ for x, y in product(cat_cols, repeat=2):
 
 heat_df = pd.concat(heat_records, ignore_index=True)
 
-bar_pie_df = df.groupby(cat_cols + ["AnoFato"]).size().reset_index(name="Quantidade")
+bar_pie_df = df.groupby(cat_cols + ["ANOFATO"]).size().reset_index(name="Quantidade")
 
-hist_df = df[["AnoFato", num_col]].dropna()
+hist_df = df[["ANOFATO", num_col]].dropna()
 
 conn = sqlite3.connect(db_path)
-heat_df.to_sql("heatmap", conn, if_exists="replace", index=False)
-bar_pie_df.to_sql("categorias", conn, if_exists="replace", index=False)
-hist_df.to_sql("histograma", conn, if_exists="replace", index=False)
+write_tables(conn, {"categorias": bar_pie_df, "heatmap": heat_df, "histograma": hist_df})
 conn.close()
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+# Bitmap indexes over the categorias table.
+#
+# One bitset per distinct value of each filter column, packed 8 rows per byte
+# (np.packbits layout). A filter is an OR of bitsets within a column and an
+# AND across columns, so any combination of sidebar filters and chart
+# selections costs a few bitwise ops over n/8 bytes instead of one `isin`
+# scan per column over the full frame.
+#
+# Like roaring bitmaps, each value picks its container: a sparse value (fewer
+# rows than n/32, e.g. one bairro out of hundreds) keeps its sorted row
+# numbers as uint32 instead of a dense n/8-byte bitset, and is set into the
+# result only when ORed. Filter results are always dense.
+
+FILTER_COLUMNS = ["ANOFATO", "TIPOVIOLENCIA", "COR_PELE", "BAIRRO"]
+
+
+class BitmapIndex:
+    def __init__(self, df: pd.DataFrame, columns=FILTER_COLUMNS):
+        self.n = len(df)
+        self.nbytes = (self.n + 7) // 8
+        self.bitmaps = {col: self._build(df[col]) for col in columns}
+
+    def _build(self, serie: pd.Series) -> dict:
+        codes, uniques = pd.factorize(serie, sort=True)
+        # rows grouped by value: each bitset is set from its own rows only,
+        # O(n) for the whole column instead of one full comparison per value
+        ordem = np.argsort(codes, kind="stable")
+        limites = np.concatenate([[0], np.cumsum(np.bincount(codes[codes >= 0], minlength=len(uniques)))])
+        ordem = ordem[(codes < 0).sum():]
+        bitmaps = {}
+        for k, valor in enumerate(uniques):
+            linhas = ordem[limites[k]:limites[k + 1]]
+            if linhas.size * 4 < self.nbytes:
+                bitmaps[valor] = np.sort(linhas).astype(np.uint32)
+            else:
+                bits = np.zeros(self.nbytes, dtype=np.uint8)
+                _set_rows(bits, linhas)
+                bitmaps[valor] = bits
+        return bitmaps
+
+    def memory_bytes(self) -> int:
+        return sum(b.nbytes for col in self.bitmaps.values() for b in col.values())
+
+    def values(self, col: str) -> list:
+        return list(self.bitmaps[col])
+
+    def everything(self) -> np.ndarray:
+        return np.packbits(np.ones(self.n, dtype=bool))
+
+    def any_of(self, col: str, values) -> np.ndarray:
+        """OR dos bitsets dos valores pedidos; valores fora do índice não marcam linhas."""
+        bits = np.zeros(self.nbytes, dtype=np.uint8)
+        for valor in values:
+            b = self.bitmaps[col].get(valor)
+            if b is None:
+                continue
+            if b.dtype == np.uint32:  # sparse container: row numbers
+                _set_rows(bits, b)
+            else:
+                np.bitwise_or(bits, b, out=bits)
+        return bits
+
+    def match(self, filtros: dict) -> np.ndarray:
+        """AND entre colunas de `filtros` ({coluna: valores}); valores None não restringem."""
+        bits = self.everything()
+        for col, values in filtros.items():
+            if values is not None:
+                np.bitwise_and(bits, self.any_of(col, values), out=bits)
+        return bits
+
+    def match_any(self, alternativas) -> np.ndarray:
+        """OR de `match` sobre uma lista de filtros (ex.: as células selecionadas de um heatmap)."""
+        bits = np.zeros(self.nbytes, dtype=np.uint8)
+        for filtros in alternativas:
+            np.bitwise_or(bits, self.match(filtros), out=bits)
+        return bits
+
+    def rows(self, bits: np.ndarray) -> np.ndarray:
+        return np.flatnonzero(np.unpackbits(bits, count=self.n))
+
+    def count(self, bits: np.ndarray) -> int:
+        return int(np.unpackbits(bits, count=self.n).sum())
+
+    def take(self, df: pd.DataFrame, bits: np.ndarray) -> pd.DataFrame:
+        return df.iloc[self.rows(bits)]
+
+
+def _set_rows(bits: np.ndarray, linhas: np.ndarray):
+    linhas = np.asarray(linhas, dtype=np.int64)
+    np.bitwise_or.at(bits, linhas >> 3, (0x80 >> (linhas & 7)).astype(np.uint8))
@@ -0,0 +1,6 @@
+import plotly.express as px
+
+
+def figure(assoc):
+    return px.imshow(assoc.round(2), text_auto=True, zmin=0, zmax=1, color_continuous_scale="RdPu",
+                     labels={"color": "V de Cramér"})
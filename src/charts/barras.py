@@ -0,0 +1,5 @@
+import plotly.express as px
+
+
+def figure(bar_df, grupo: str):
+    return px.bar(bar_df, x=grupo, y="Quantidade", color=grupo, color_discrete_sequence=px.colors.sequential.RdPu)
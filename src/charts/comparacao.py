@@ -0,0 +1,17 @@
+import plotly.express as px
+
+CORES = [px.colors.sequential.RdPu[4], px.colors.sequential.RdPu[8]]
+
+
+def figure(df, titulo: str, rotulo: str, altura: int):
+    fig = px.bar(df, x="chave", y="valor", color="cidade", barmode="group", color_discrete_sequence=CORES,
+                 labels={"chave": titulo, "valor": rotulo, "cidade": "Cidade"})
+    fig.update_layout(legend=dict(orientation="h", y=1.1), height=altura)
+    return fig
+
+
+def figure_anos(por_ano):
+    fig = px.line(por_ano, x="ANOFATO", y="Quantidade", color="cidade", markers=True, color_discrete_sequence=CORES,
+                  labels={"ANOFATO": "Ano", "cidade": "Cidade"})
+    fig.update_xaxes(dtick=1)
+    return fig
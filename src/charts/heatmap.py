@@ -0,0 +1,15 @@
+import numpy as np
+import plotly.graph_objects as go
+
+
+def figure(matriz: dict, titulo: str) -> go.Figure:
+    """Heatmap direto da matriz de src.aggregations.heatmap_matrix (z, x, y)."""
+    z, x, y = matriz["z"], matriz["x"], matriz["y"]
+    fig = go.Figure(go.Heatmap(z=z, x=x, y=y, colorscale="RdPu", hoverinfo="skip"))
+    # heatmap traces don't emit selections; invisible markers on the cells make them clickable
+    cell_x, cell_y = np.meshgrid(x, y)
+    fig.add_trace(go.Scatter(x=cell_x.ravel(), y=cell_y.ravel(), customdata=z.ravel(), mode="markers",
+                             marker=dict(opacity=0, size=24), showlegend=False,
+                             hovertemplate="%{x} × %{y}: %{customdata}<extra></extra>"))
+    fig.update_layout(title=titulo, title_x=0.5)
+    return fig
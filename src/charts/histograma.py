@@ -0,0 +1,14 @@
+import plotly.express as px
+import plotly.graph_objects as go
+
+
+def figure(hist_df, nbins: int):
+    return px.histogram(hist_df, x="IDADE", nbins=nbins, color_discrete_sequence=["#800080"])
+
+
+def figure_bins(hist_df) -> go.Figure:
+    """Histograma já agregado (src.aggregations.age_bins): uma barra por faixa."""
+    fig = go.Figure(go.Bar(x=(hist_df["inicio"] + hist_df["fim"]) / 2, y=hist_df["Quantidade"],
+                           width=hist_df["fim"] - hist_df["inicio"], marker_color="#800080"))
+    fig.update_layout(xaxis_title="IDADE", yaxis_title="count", bargap=0)
+    return fig
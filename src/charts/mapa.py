@@ -0,0 +1,41 @@
+import plotly.express as px
+
+
+def casos(geojson_map, locations, featureidkey, casos, cidade: dict, altura: int):
+    return _layout(px.choropleth_mapbox(
+        geojson=geojson_map,
+        locations=locations,
+        featureidkey=featureidkey,
+        color=casos,
+        mapbox_style="carto-positron",
+        zoom=cidade["zoom"],
+        center=cidade["center"],
+        opacity=0.65,
+        color_continuous_scale="RdPu",
+        height=altura,
+        labels={"color": "Número de casos"}
+    ))
+
+
+def hotspots(geojson_map, locations, featureidkey, gi, lim: float, nomes, hover_data: dict, cidade: dict, altura: int):
+    return _layout(px.choropleth_mapbox(
+        geojson=geojson_map,
+        locations=locations,
+        featureidkey=featureidkey,
+        color=gi,
+        hover_name=nomes,
+        hover_data=hover_data,
+        mapbox_style="carto-positron",
+        zoom=cidade["zoom"],
+        center=cidade["center"],
+        opacity=0.65,
+        color_continuous_scale="RdBu_r",
+        range_color=(-lim, lim),
+        height=altura,
+        labels={"color": "Gi* (z)"}
+    ))
+
+
+def _layout(fig):
+    fig.update_layout(margin=dict(l=0, r=0, t=0, b=0), paper_bgcolor="rgba(0,0,0,0)")
+    return fig
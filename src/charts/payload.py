@@ -0,0 +1,211 @@
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import streamlit as st
+from streamlit.errors import StreamlitAPIException
+from streamlit.logger import get_logger
+
+from src import disk_cache
+
+# Figure payload cache.
+#
+# A panel's figure is stored as the Plotly JSON that goes to the browser,
+# keyed by (panel, dataset version, filter state + layout). A repeated view
+# sends the cached JSON as-is: no aggregation, no Plotly objects, no
+# validation or serialization. Entries live in a per-process LRU bounded by
+# the total JSON size (SOBREVIDA_FIGURE_CACHE_MB, default 64) and, when
+# SOBREVIDA_CACHE_DIR is set, in the shared disk cache for the other workers.
+#
+# Sizes are logged per panel (`streamlit run app.py --logger.level=info`).
+
+MAX_BYTES = int(float(os.environ.get("SOBREVIDA_FIGURE_CACHE_MB", "64")) * 1024 * 1024)
+# st.plotly_chart rebuilds a go.Figure from any input (~0.4 s for the full
+# map), so on the streamlit versions checked against its internals the JSON
+# goes straight into the chart element; any other version, any failure of
+# that path or SOBREVIDA_PLOTLY_JSON=0 uses the public st.plotly_chart.
+# `python -m src.charts.payload` fails when the streamlit pinned in
+# requirements.txt is not in VERSOES_VERIFICADAS, or when the element built
+# by _json_element no longer matches the one st.plotly_chart builds.
+JSON_DIRETO = os.environ.get("SOBREVIDA_PLOTLY_JSON", "1") != "0"
+VERSOES_VERIFICADAS = {"1.38.0"}
+
+REQUIREMENTS = Path(__file__).resolve().parents[2] / "requirements.txt"
+
+_LOG = get_logger(__name__)
+_memo = OrderedDict()
+_memo_bytes = 0
+_lock = threading.Lock()
+
+
+def cached_payload(painel: str, versao: str, params, build) -> dict:
+    """{"spec": json, "caption": str} ou {"info": str} do painel, montado por `build()` só na falta.
+
+    `build()` devolve uma figura, (figura, legenda) ou o texto de aviso
+    quando não há o que desenhar.
+    """
+    key = disk_cache.cache_key(f"figura_{painel}", versao, params)
+    with _lock:
+        payload = _memo.get(key)
+        if payload is not None:
+            _memo.move_to_end(key)
+    origem = "memória"
+    if payload is None:
+        origem = "disco"
+        payload = disk_cache.get(f"figura_{painel}", versao, params)
+        if payload is None:
+            origem = "nova"
+            payload = _serialize(build())
+            disk_cache.put(f"figura_{painel}", versao, params, payload)
+        _remember(key, payload)
+    if "spec" in payload:
+        _LOG.info("figura %s: %.1f kB (%s)", painel, len(payload["spec"]) / 1024, origem)
+    return payload
+
+
+def _tamanho(payload: dict) -> int:
+    return len(payload.get("spec") or payload.get("info") or "")
+
+
+def _remember(key: str, payload: dict):
+    global _memo_bytes
+    if _tamanho(payload) > MAX_BYTES:
+        return
+    with _lock:
+        if key in _memo:
+            return
+        _memo[key] = payload
+        _memo_bytes += _tamanho(payload)
+        while _memo_bytes > MAX_BYTES:
+            _, antigo = _memo.popitem(last=False)
+            _memo_bytes -= _tamanho(antigo)
+
+
+def _serialize(resultado) -> dict:
+    if isinstance(resultado, str):
+        return {"info": resultado}
+    import plotly.io
+
+    fig, caption = resultado if isinstance(resultado, tuple) else (resultado, None)
+    return {"spec": plotly.io.to_json(fig, validate=False), "caption": caption}
+
+
+def show(painel: str, versao: str, params, build, key=None, on_select="ignore", selection_mode="points"):
+    """Desenha o painel a partir do cache de figuras (ver `cached_payload`)."""
+    payload = cached_payload(painel, versao, params, build)
+    if "info" in payload:
+        st.info(payload["info"])
+        return
+    plotly_json_chart(payload["spec"], key=key, on_select=on_select, selection_mode=selection_mode)
+    if payload["caption"]:
+        st.caption(payload["caption"])
+
+
+def plotly_json_chart(spec: str, key=None, on_select="ignore", selection_mode="points"):
+    """st.plotly_chart(use_container_width=True) para uma figura já serializada."""
+    global JSON_DIRETO
+    if JSON_DIRETO and st.__version__ in VERSOES_VERIFICADAS:
+        try:
+            return _json_element(spec, key, on_select, selection_mode)
+        except StreamlitAPIException:
+            raise
+        except Exception as e:  # internals moved: nothing was enqueued yet
+            JSON_DIRETO = False
+            _LOG.warning("envio direto do JSON falhou (%r); usando st.plotly_chart daqui em diante", e)
+    import plotly.io
+
+    return st.plotly_chart(plotly.io.from_json(spec, skip_invalid=True), use_container_width=True, key=key,
+                           on_select=on_select, selection_mode=selection_mode)
+
+
+def _json_element(spec: str, key, on_select, selection_mode):
+    # mirrors the body of st.plotly_chart in streamlit 1.38 minus the figure rebuild
+    from streamlit.elements.form_utils import current_form_id
+    from streamlit.elements.lib.utils import to_key
+    from streamlit.elements.plotly_chart import PlotlyChartSelectionSerde, parse_selection_mode
+    from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+    from streamlit.runtime.scriptrunner_utils.script_run_context import get_script_run_ctx
+    from streamlit.runtime.state import register_widget
+    from streamlit.runtime.state.common import compute_widget_id
+
+    dg = st._main
+    key = to_key(key)
+    selecao = on_select != "ignore"
+    proto = PlotlyChartProto()
+    proto.use_container_width = True
+    proto.theme = "streamlit"
+    proto.form_id = current_form_id(dg)
+    proto.spec = spec
+    proto.config = json.dumps({"showLink": False, "linkText": False})
+    ctx = get_script_run_ctx()
+    proto.id = compute_widget_id(
+        "plotly_chart", user_key=key, key=key, plotly_spec=proto.spec, plotly_config=proto.config,
+        selection_mode=selection_mode, is_selection_activated=selecao, theme="streamlit",
+        form_id=proto.form_id, use_container_width=True, page=ctx.active_script_hash if ctx else None,
+    )
+    if not selecao:
+        return dg._enqueue("plotly_chart", proto)
+    proto.selection_mode.extend(parse_selection_mode(selection_mode))
+    serde = PlotlyChartSelectionSerde()
+    estado = register_widget("plotly_chart", proto, user_key=key,
+                             on_change_handler=on_select if callable(on_select) else None,
+                             deserializer=serde.deserialize, serializer=serde.serialize, ctx=ctx)
+    dg._enqueue("plotly_chart", proto)
+    return estado.value
+
+
+def _comparison_script():
+    # AppTest script: the same figure through _json_element or st.plotly_chart
+    import plotly.graph_objects as go
+    import plotly.io
+    import streamlit as st
+
+    from src.charts import payload
+
+    spec = plotly.io.to_json(go.Figure(go.Bar(x=[1, 2], y=[3, 4])), validate=False)
+    if st.session_state["caminho"] == "direto":
+        payload._json_element(spec, "grafico", "rerun", ["points", "box"])
+    else:
+        st.plotly_chart(plotly.io.from_json(spec), use_container_width=True, key="grafico",
+                        on_select="rerun", selection_mode=["points", "box"])
+
+
+def check_internals() -> list:
+    """Problemas que invalidam o envio direto do JSON nesta árvore (lista vazia se nenhum)."""
+    pino = re.search(r"^streamlit==(\S+)", REQUIREMENTS.read_text(encoding="utf-8"), re.M)
+    if pino is None or pino.group(1) not in VERSOES_VERIFICADAS:
+        fixada = pino.group(1) if pino else "sem versão fixa"
+        return [f"requirements.txt fixa streamlit {fixada}, fora de VERSOES_VERIFICADAS {sorted(VERSOES_VERIFICADAS)}: "
+                "confira _json_element contra o st.plotly_chart dessa versão antes de acrescentá-la"]
+    if st.__version__ != pino.group(1):
+        return [f"streamlit instalado {st.__version__}, requirements.txt fixa {pino.group(1)}"]
+
+    from streamlit.testing.v1 import AppTest
+
+    elementos = {}
+    for caminho in ("direto", "publico"):
+        at = AppTest.from_function(_comparison_script)
+        at.session_state["caminho"] = caminho
+        at.run()
+        if at.exception:
+            return [f"caminho {caminho}: {at.exception[0].message}"]
+        proto = at.get("plotly_chart")[0].proto
+        proto.ClearField("id")  # hashes the spec text, which plotly re-serializes differently
+        proto.ClearField("spec")
+        elementos[caminho] = proto
+    if elementos["direto"] != elementos["publico"]:
+        return [f"o elemento de _json_element difere do de st.plotly_chart:\n{elementos['direto']}\n{elementos['publico']}"]
+    return []
+
+
+if __name__ == "__main__":
+    falhas = check_internals()
+    for falha in falhas:
+        print(f"✘ {falha}", file=sys.stderr)
+    if falhas:
+        sys.exit(1)
+    print(f"✔ envio direto do JSON confere com st.plotly_chart do streamlit {st.__version__}")
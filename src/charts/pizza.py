@@ -0,0 +1,13 @@
+import plotly.express as px
+
+
+def figure(pie_df, nomes: str = "COR_PELE"):
+    # plotly pie traces can't be selected, so the shares are drawn as bars:
+    # a click on a bar cross-filters the other panels like the bar chart does
+    df = pie_df.assign(Percentual=pie_df["Quantidade"] / pie_df["Quantidade"].sum() * 100)
+    df = df.sort_values("Quantidade")
+    fig = px.bar(df, x="Percentual", y=nomes, color=nomes, orientation="h", text=df["Percentual"].round(1).astype(str) + "%",
+                 hover_data={"Quantidade": True, "Percentual": ":.1f"},
+                 color_discrete_sequence=px.colors.sequential.RdPu)
+    fig.update_layout(showlegend=False, xaxis_title="% dos casos", yaxis_title=None)
+    return fig
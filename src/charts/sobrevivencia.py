@@ -0,0 +1,18 @@
+import pandas as pd
+import plotly.express as px
+
+
+def figure(curvas: pd.DataFrame, rotulo: str, altura: int = 450):
+    """Curvas de Kaplan–Meier em degraus, uma por estrato, todas começando em (0, 100%)."""
+    inicio = pd.DataFrame({"estrato": curvas["estrato"].unique(), "dias": 0, "sobrevida": 1.0,
+                           "ic_inf": 1.0, "ic_sup": 1.0, "em_risco": None})
+    df = pd.concat([inicio, curvas], ignore_index=True).sort_values(["estrato", "dias"], kind="stable")
+    df["estrato"] = df["estrato"].astype(str)
+    fig = px.line(df, x="dias", y="sobrevida", color="estrato", line_shape="hv",
+                  hover_data={"ic_inf": ":.1%", "ic_sup": ":.1%", "em_risco": True},
+                  color_discrete_sequence=px.colors.qualitative.Dark24,
+                  labels={"dias": "Dias desde a instauração", "sobrevida": "Inquéritos ainda não remetidos",
+                          "estrato": rotulo, "em_risco": "Em aberto", "ic_inf": "IC 95% inf.", "ic_sup": "IC 95% sup."})
+    fig.update_yaxes(tickformat=".0%", range=[0, 1.02])
+    fig.update_layout(height=altura, legend=dict(title=rotulo))
+    return fig
@@ -0,0 +1,51 @@
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+VAZIO = "#ccc"
+
+
+def cells(totais: np.ndarray, n: int = 100) -> np.ndarray:
+    """Células de cada categoria somando `n`, pelo método dos maiores restos.
+
+    Cada categoria fica com o piso da sua cota e as células que sobram vão
+    para os maiores restos; nenhuma fica negativa, por mais categorias que haja.
+    """
+    cotas = np.asarray(totais, dtype=float) / np.sum(totais) * n
+    celulas = np.floor(cotas).astype(int)
+    sobra = n - celulas.sum()
+    celulas[np.argsort(-(cotas - celulas), kind="stable")[:sobra]] += 1
+    return celulas
+
+
+def figure(prev) -> go.Figure:
+    """Waffle 10×10 a partir de `prev` (TipoViolencia, Total, Perc), num único trace de grade.
+
+    Cada célula é o código da categoria; a escala de cores é discreta (um
+    degrau por categoria) e a barra de cores faz o papel de legenda.
+    """
+    categorias = prev["TipoViolencia"].tolist()
+    k = len(categorias)
+    # codes in reading order (row 0 at the top), padded with k ("sem categoria")
+    codigos = np.repeat(np.arange(k), prev["Perc"].to_numpy())[:100]
+    codigos = np.concatenate([codigos, np.full(100 - len(codigos), k)]).reshape(10, 10)
+
+    palette = px.colors.sequential.RdPu
+    cores = [palette[i % len(palette)] for i in range(k)] + [VAZIO] * int(codigos.max() == k)
+    rotulos = [f"{cat} ({tot})" for cat, tot in zip(categorias, prev["Total"])] + [""]
+    escala = []
+    for i, cor in enumerate(cores):
+        escala += [(i / len(cores), cor), ((i + 1) / len(cores), cor)]
+
+    fig_waffle = go.Figure(go.Heatmap(
+        z=codigos[::-1], zmin=-0.5, zmax=len(cores) - 0.5, colorscale=escala, xgap=1, ygap=1,
+        customdata=np.array(rotulos, dtype=object)[codigos[::-1]], hovertemplate="%{customdata}<extra></extra>",
+        colorbar=dict(tickvals=list(range(k)), ticktext=rotulos[:k], thickness=14, len=1, x=1.02),
+    ))
+    fig_waffle.update_layout(xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+                             yaxis=dict(showgrid=False, zeroline=False, showticklabels=False, scaleanchor="x"),
+                             width=None, height=380, paper_bgcolor="rgba(0,0,0,0)",
+                             plot_bgcolor="rgba(0,0,0,0)",
+                             margin=dict(l=0, r=120, t=30, b=0),
+                             title=dict(text="Waffle Chart — Prevalência da Violência", x=0, y=0.97, xanchor="left", font=dict(size=18)))
+    return fig_waffle
@@ -0,0 +1,94 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.export import build_query
+from src.normalizacao import normalizar_serie
+from src.schema import check_db_schema
+
+# BH × POA comparison.
+#
+# Both cities follow the schema contract (src/schema.py), so the shared
+# dimensions are the same columns with the same dtypes. Both ETLs currently
+# strip accents from these values, but the contract does not require it
+# (`conform` keeps accents), so values are still compared through an
+# accent-free key; on these few hundred GROUP BY rows it costs nothing.
+#
+# Each city runs on its own thread and only reads GROUP BY results: the
+# aggregation happens inside SQLite, which runs without the GIL, and only a
+# few hundred rows cross into Python. Loading the full tables instead would
+# spend most of the time building Python rows under the GIL and the threads
+# would run one after the other.
+
+DIMENSOES = ["TIPOVIOLENCIA", "COR_PELE"]
+# fixed 5-year bins so both cities share the same edges (last one is open)
+IDADE_PASSO = 5
+IDADE_BORDAS = np.arange(0, 105, IDADE_PASSO)
+
+_SQL_IDADES = f"""
+    SELECT ANOFATO, MIN(MAX(CAST(IDADE / {IDADE_PASSO} AS INTEGER), 0), {len(IDADE_BORDAS) - 2}) AS faixa,
+           COUNT(*) AS Quantidade
+    FROM histograma WHERE IDADE IS NOT NULL GROUP BY ANOFATO, faixa
+"""
+
+
+def age_label(faixa: int) -> str:
+    """Rótulo da faixa de idade; a última é aberta ("95+")."""
+    if faixa >= len(IDADE_BORDAS) - 2:
+        return f"{IDADE_BORDAS[faixa]}+"
+    return f"{IDADE_BORDAS[faixa]}–{IDADE_BORDAS[faixa + 1] - 1}"
+
+
+def city_profile(db_path: str) -> dict:
+    """Totais por ano × dimensão e por ano × faixa de idade de uma cidade."""
+    check_db_schema(db_path)
+    perfil = {}
+    conn = sqlite3.connect(db_path)
+    try:
+        for col in DIMENSOES:
+            sql, params = build_query("categorias", {}, group_by=["ANOFATO", col], sum_col="Quantidade")
+            df = pd.read_sql(sql, conn, params=params)
+            df["chave"] = normalizar_serie(df[col])
+            perfil[col] = df.groupby(["ANOFATO", "chave"])["Quantidade"].sum().reset_index()
+
+        hist = pd.read_sql(_SQL_IDADES, conn)
+        sql, params = build_query("categorias", {}, group_by=["ANOFATO"], sum_col="Quantidade")
+        perfil["por_ano"] = pd.read_sql(sql, conn, params=params)
+    finally:
+        conn.close()
+
+    hist["chave"] = [age_label(f) for f in hist["faixa"]]
+    perfil["IDADE"] = hist[["ANOFATO", "chave", "faixa", "Quantidade"]]
+    perfil["anos"] = [int(a) for a in perfil["por_ano"]["ANOFATO"]]
+    return perfil
+
+
+def compare_cities(db_paths: dict) -> dict:
+    """{nome: perfil} com as cidades carregadas em paralelo."""
+    with ThreadPoolExecutor(max_workers=len(db_paths)) as pool:
+        futuros = {nome: pool.submit(city_profile, db) for nome, db in db_paths.items()}
+        return {nome: f.result() for nome, f in futuros.items()}
+
+
+def aligned(perfis: dict, dimensao: str, anos, relativo: bool = False) -> pd.DataFrame:
+    """Formato longo (cidade, chave, valor) com as categorias de todas as cidades.
+
+    Categoria ausente numa cidade entra com 0; com `relativo` o valor é o % do
+    total da cidade nos anos escolhidos.
+    """
+    tabelas = {}
+    for nome, perfil in perfis.items():
+        df = perfil[dimensao]
+        tabelas[nome] = df[df["ANOFATO"].isin(anos)].groupby("chave")["Quantidade"].sum()
+    largo = pd.DataFrame(tabelas).fillna(0)
+    if dimensao == "IDADE":
+        ordem = {c: f for p in perfis.values() for c, f in zip(p["IDADE"]["chave"], p["IDADE"]["faixa"])}
+        largo = largo.loc[sorted(largo.index, key=ordem.get)]
+    else:
+        largo = largo.loc[largo.sum(axis=1).sort_values(ascending=False).index]
+    if relativo:
+        totais = largo.sum()
+        largo = (largo / totais.where(totais > 0) * 100).fillna(0).round(1)
+    return largo.reset_index(names="chave").melt(id_vars="chave", var_name="cidade", value_name="valor")
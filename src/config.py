@@ -0,0 +1,42 @@
+import os
+
+# -----------------------
+# CIDADES
+# -----------------------
+# SOBREVIDA_BH_DB / SOBREVIDA_POA_DB point the app at other DBs (e.g. the
+# synthetic ones from src/fixture_db.py used by src/loadtest.py)
+PATH_BH_DB = os.environ.get("SOBREVIDA_BH_DB", "./data/violencia.db")
+PATH_BH_GEO = "./data/bairros_ll.geojson"
+
+PATH_POA_DB = os.environ.get("SOBREVIDA_POA_DB", "porto_alegre.db")
+PATH_POA_GEO = "./data/bairros_poa.geojson"
+
+# slug -> configuração; o nome é o que aparece no seletor "Fonte dos dados"
+CIDADES = {
+    "bh": {
+        "nome": "Belo Horizonte",
+        "db": PATH_BH_DB,
+        "geo": PATH_BH_GEO,
+        "shape_col": "BAIRRO_PAD",
+        "center": {"lat": -19.92, "lon": -43.94},
+        "zoom": 11,
+    },
+    "poa": {
+        "nome": "Porto Alegre",
+        "db": PATH_POA_DB,
+        "geo": PATH_POA_GEO,
+        # POA geojson may have different property name; we'll not try to normalize property column name
+        "shape_col": None,
+        "center": {"lat": -30.03, "lon": -51.23},
+        "zoom": 11,
+    },
+}
+
+# endereço público da API (src/api.py), que também serve os arquivos de exportação
+API_URL = os.environ.get("SOBREVIDA_API_URL", "http://localhost:8502").rstrip("/")
+
+def cidade_por_nome(nome: str) -> dict:
+    for cfg in CIDADES.values():
+        if cfg["nome"] == nome:
+            return cfg
+    raise KeyError(nome)
@@ -1,8 +1,13 @@
+import sys
 import geopandas as gpd
 import pandas as pd
 import sqlite3
+from pathlib import Path
 from rapidfuzz import process, fuzz
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.normalizacao import normalizar_serie
+
 SHAPE_PATH = "BAIRRO_POPULAR.shp"  
 OUT_PATH = "BAIRRO_PADRONIZADO.shp"
 DB_PATH = "violencia.db"
@@ -12,13 +17,14 @@ DATA_COL = "BAIRRO"
 
 
 gdf = gpd.read_file(SHAPE_PATH)
-gdf[SHAPE_COL] = gdf[SHAPE_COL].astype(str).str.upper().str.strip()
+# same normalizer as the ETL (src/normalizacao.py): BAIRRO_PAD must equal the DB values
+gdf[SHAPE_COL] = normalizar_serie(gdf[SHAPE_COL], manter_na=False)
 
 conn = sqlite3.connect(DB_PATH)
 df = pd.read_sql("SELECT DISTINCT BAIRRO FROM categorias", conn)
 conn.close()
 
-df["BAIRRO"] = df["BAIRRO"].astype(str).str.upper().str.strip()
+df["BAIRRO"] = normalizar_serie(df["BAIRRO"], manter_na=False)
 bairros_pad = df["BAIRRO"].dropna().unique().tolist()
 
 print(f"Total de bairros no banco: {len(bairros_pad)}")
@@ -1,8 +1,13 @@
+import sys
 import pandas as pd
 import sqlite3
 import numpy as np
+from pathlib import Path
 
-df = pd.read_excel("../data/PortoAlegre_total/dados_corrigidos.xlsx", header=1)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.normalizacao import normalizar_colunas, normalizar_serie
+from src.schema import write_tables
+from src.sobrevivencia import inquiry_table
 
 df = pd.read_csv("../data/resultado.csv")
 domestic = ['LESAO CORPORAL', 'LESAO CORPORAL LEVE', 'AMEACA', 'ESTUPRO',
@@ -22,26 +27,14 @@ with open('totalCrimes.txt', 'w+') as file2:
 
 df = df[df['Desc Fato'].isin(domestic)].reset_index(drop=True)
 
-df.columns = (
-    df.columns.str.strip()
-    .str.lower()
-    .str.replace(" ", "_")
-    .str.replace("ç", "c")
-    .str.replace("ã", "a")
-    .str.replace("õ", "o")
-    .str.replace("á", "a")
-    .str.replace("é", "e")
-    .str.replace("í", "i")
-    .str.replace("ó", "o")
-    .str.replace("ú", "u")
-)
+df.columns = normalizar_colunas(df.columns)
 
 
 df["ano"] = df["ano_fato"].astype(int)
-df["bairro"] = df["bairro"].astype(str).str.upper().str.strip()
-df["tipo_fato"] = df["desc_fato"].astype(str).str.upper().str.strip()
-df["genero"] = df["genero"].astype(str).str.upper().str.strip()
-df["cor_autodeclarada"] = df["cor_autodeclarada"].astype(str).str.upper().str.strip()
+df["bairro"] = normalizar_serie(df["bairro"], manter_na=False)
+df["tipo_fato"] = normalizar_serie(df["desc_fato"], manter_na=False)
+df["genero"] = normalizar_serie(df["genero"], manter_na=False)
+df["cor_autodeclarada"] = normalizar_serie(df["cor_autodeclarada"], manter_na=False)
 
 faltantes = {
     "escolaridade": "",
@@ -55,7 +48,7 @@ for col, default_value in faltantes.items():
         df[col] = default_value
 
 df_categorias = df.rename(columns={
-    "ano": "AnoFato",
+    "ano": "ANOFATO",
     "tipo_fato": "TIPOVIOLENCIA",
     "idade_participante": "FaixaEtária",
     "genero": "Sexo",
@@ -73,13 +66,13 @@ df_categorias["Quantidade"] = df_categorias["Quantidade"].fillna(1).astype(int)
 df_categorias = df_categorias[
     ["TIPOVIOLENCIA", "BAIRRO", "FaixaEtária", "Sexo", "COR_PELE",
      "Escolaridade", "RelaçãoVítimaAutor", "TipoEnvolvimento",
-     "GrauLesão", "AnoFato", "Quantidade"]
+     "GrauLesão", "ANOFATO", "Quantidade"]
 ]
 
 df_hist = df.rename(columns={
-    "ano": "AnoFato",
+    "ano": "ANOFATO",
     "idade_participante": "IDADE"
-})[["AnoFato", "IDADE"]]
+})[["ANOFATO", "IDADE"]]
 
 heat_rows = []
 
@@ -97,7 +90,7 @@ for eixo_x in cat_cols:
             continue 
 
         temp = (
-            df_base.groupby([eixo_x, eixo_y, "AnoFato"])["Quantidade"]
+            df_base.groupby([eixo_x, eixo_y, "ANOFATO"])["Quantidade"]
             .sum().reset_index()
             .rename(columns={
                 eixo_x: "X_val",
@@ -113,17 +106,21 @@ for eixo_x in cat_cols:
 df_heatmap = pd.concat(heat_rows, ignore_index=True)
 
 df_heatmap = df_heatmap[
-    ["X_val", "Y_val", "AnoFato", "Quantidade", "EixoX", "EixoY"]
+    ["X_val", "Y_val", "ANOFATO", "Quantidade", "EixoX", "EixoY"]
 ]
 
+# tempos de tramitação dos inquéritos: datas viram dias desde a instauração (src/sobrevivencia.py)
+df_inqueritos = inquiry_table([pd.read_csv("../data/dados_porto_alegre/vitimas4.csv"),
+                               pd.read_csv("../data/dados_porto_alegre/agressores4.csv")])
+
 conn = sqlite3.connect("porto_alegre.db")
 
-df_categorias.to_sql("categorias", conn, if_exists="replace", index=False)
-df_hist.to_sql("histograma", conn, if_exists="replace", index=False)
-df_heatmap.to_sql("heatmap", conn, if_exists="replace", index=False)
+# casts/normalizes to the schema contract (src/schema.py) and stamps its version
+write_tables(conn, {"categorias": df_categorias, "histograma": df_hist, "heatmap": df_heatmap,
+                    "inqueritos": df_inqueritos})
 
 conn.close()
 
 print("\n✔ Banco porto_alegre.db criado com sucesso!")
-print("✔ Tabelas criadas: categorias, histograma, heatmap")
+print("✔ Tabelas criadas: categorias, histograma, heatmap, inqueritos")
 print("✔ Compatível com o app de BH (incluindo o HEATMAP)")
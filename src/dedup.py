@@ -0,0 +1,86 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.normalizacao import normalizar_colunas, normalizar_serie
+
+# Row fingerprints to deduplicate the merged Porto Alegre extracts.
+#
+# A fingerprint is a 64-bit hash (pd.util.hash_pandas_object, stable across
+# runs and pandas sessions) of the occurrence key plus a few normalized
+# fields: text upper-cased without accents, numbers in one format ("23",
+# "23.0" and 23 agree), missing values as "". The fingerprints already merged
+# are kept as a sorted uint64 array on disk, one entry per merged row, so a
+# fingerprint's multiplicity is its number of repeats. Identical rows inside
+# one extract can be distinct victims (rows without occurrence number or
+# location are common), so they are never collapsed: a new extract only
+# drops the copies of a fingerprint that the index already holds. Lookups
+# are np.searchsorted over the whole extract and the new rows are inserted
+# in place, O(m log n) for m new rows with no pairwise comparison.
+
+# occurrence number first; it is blank in part of the extracts, so the other
+# fields of the record have to be in the key or distinct victims would collide
+DEDUP_COLUMNS = ["nro_int_ocor", "ano_fato", "grupo_fato", "desc_fato", "tipo_fato", "tipo_particip",
+                 "idade_participante", "sexo", "genero", "estado_civil", "instrucao", "cor_cadastro",
+                 "cor_autodeclarada", "med_protetiva", "lat", "lng", "bairro", "municipio"]
+
+
+def _key_frame(df: pd.DataFrame, cols) -> pd.DataFrame:
+    nomes = dict(zip(normalizar_colunas(df.columns), df.columns))
+    chave = {}
+    for col in cols:
+        if col not in nomes:
+            chave[col] = np.full(len(df), "", dtype=object)
+            continue
+        serie = df[nomes[col]]
+        num = pd.to_numeric(serie, errors="coerce")
+        texto = normalizar_serie(serie.astype("string").fillna(""), acentos=False)
+        chave[col] = np.where(num.notna(), num.astype("Float64").astype(str), texto)
+    return pd.DataFrame(chave, index=df.index)
+
+
+def fingerprints(df: pd.DataFrame, cols=DEDUP_COLUMNS) -> np.ndarray:
+    return pd.util.hash_pandas_object(_key_frame(df, cols), index=False).to_numpy()
+
+
+def load_fingerprints(path) -> np.ndarray:
+    path = Path(path)
+    return np.load(path) if path.exists() else np.empty(0, dtype=np.uint64)
+
+
+def save_fingerprints(path, conhecidos: np.ndarray):
+    path = Path(path)
+    tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+    np.save(tmp, conhecidos)
+    tmp.replace(path)
+
+
+def split_new(df: pd.DataFrame, conhecidos: np.ndarray, cols=DEDUP_COLUMNS):
+    """Separa as linhas inéditas de `df`.
+
+    Devolve (linhas novas, índice atualizado, clusters). A k-ésima cópia de um
+    fingerprint em `df` é nova se o índice tem menos de k cópias dele; clusters
+    tem uma linha por fingerprint repetido em `df` ou já presente no índice.
+    """
+    fp = fingerprints(df, cols)
+    no_indice = np.searchsorted(conhecidos, fp, side="right") - np.searchsorted(conhecidos, fp, side="left")
+    # 0 for the first copy of a fingerprint in df, 1 for the second...
+    copia = pd.Series(fp).groupby(fp, sort=False).cumcount().to_numpy()
+    novos = copia >= no_indice
+
+    valores, primeiro, contagem = np.unique(fp, return_index=True, return_counts=True)
+    ja = no_indice[primeiro]
+    suspeitos = (contagem > 1) | (ja > 0)
+    clusters = pd.DataFrame({
+        "fingerprint": [f"{v:016x}" for v in valores[suspeitos]],
+        "linhas": contagem[suspeitos],
+        "no_indice": ja[suspeitos],
+        "novas": np.maximum(contagem - ja, 0)[suspeitos],
+    }).sort_values("linhas", ascending=False, ignore_index=True)
+
+    # sorted insert instead of re-sorting the whole index
+    inseridos = np.sort(fp[novos])
+    atualizado = np.insert(conhecidos, np.searchsorted(conhecidos, inseridos), inseridos)
+    return df[novos], atualizado, clusters
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: eviction runs without the cross-process lock
+    fcntl = None
+
+# Optional cache shared by every Streamlit/API process on the same host.
+#
+# Enable it by pointing SOBREVIDA_CACHE_DIR at a local directory. Entries are
+# keyed by (namespace, dataset version, canonical filter state); a new ETL run
+# changes the version, so stale entries are never read and age out through
+# the size-bounded LRU eviction (SOBREVIDA_CACHE_MAX_MB, default 512).
+#
+# Writes go to a temp file in the same directory followed by os.replace, so
+# concurrent writers of the same key are safe (last one wins, readers only
+# ever see complete files).
+
+CACHE_DIR = os.environ.get("SOBREVIDA_CACHE_DIR", "")
+MAX_BYTES = int(float(os.environ.get("SOBREVIDA_CACHE_MAX_MB", "512")) * 1024 * 1024)
+EVICT_EVERY_S = 30
+
+_MISS = object()
+_last_evict = 0.0
+
+
+def enabled() -> bool:
+    return bool(CACHE_DIR)
+
+
+def cache_key(namespace: str, version: str, params) -> str:
+    canonical = json.dumps([namespace, version, params], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _entry_path(namespace: str, key: str) -> Path:
+    safe_ns = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in namespace)
+    return Path(CACHE_DIR) / safe_ns / key[:2] / f"{key}.pkl"
+
+
+def get(namespace: str, version: str, params, default=None):
+    if not enabled():
+        return default
+    path = _entry_path(namespace, cache_key(namespace, version, params))
+    try:
+        with open(path, "rb") as f:
+            value = pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return default
+    try:
+        # bump mtime so eviction is least-recently-used, not least-recently-written
+        os.utime(path)
+    except FileNotFoundError:
+        pass
+    return value
+
+
+def put(namespace: str, version: str, params, value):
+    if not enabled():
+        return
+    path = _entry_path(namespace, cache_key(namespace, version, params))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    finally:
+        Path(tmp).unlink(missing_ok=True)
+    _maybe_evict()
+
+
+def cached(namespace: str, version: str, params, compute):
+    """Devolve o valor em cache ou calcula com `compute()` e grava para os outros workers."""
+    if not enabled():
+        return compute()
+    value = get(namespace, version, params, default=_MISS)
+    if value is _MISS:
+        value = compute()
+        put(namespace, version, params, value)
+    return value
+
+
+def _maybe_evict():
+    global _last_evict
+    now = time.monotonic()
+    if now - _last_evict < EVICT_EVERY_S:
+        return
+    _last_evict = now
+    evict(MAX_BYTES)
+
+
+def evict(max_bytes: int = MAX_BYTES) -> int:
+    """Apaga as entradas usadas há mais tempo até o cache caber em `max_bytes`."""
+    root = Path(CACHE_DIR)
+    if not enabled() or not root.exists():
+        return 0
+    with open(root / ".evict.lock", "a") as lock:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                return 0  # another process is already evicting
+
+        entries, total = [], 0
+        for path in root.glob("*/*/*.pkl"):
+            try:
+                st_entry = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st_entry.st_mtime, st_entry.st_size, path))
+            total += st_entry.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+    return removed
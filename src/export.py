@@ -0,0 +1,240 @@
+import csv
+import hmac
+import os
+import re
+import secrets
+import sqlite3
+import hashlib
+import json
+import tempfile
+import time
+from urllib.parse import urlencode
+from pathlib import Path
+
+import pandas as pd
+
+from src.schema import TABLES
+
+EXPORT_DIR = Path(tempfile.gettempdir()) / "sobrevida_exports"
+CHUNK_ROWS = 50_000
+# EXPORT_DIR is pruned on each export: files unused for longer than
+# EXPORT_MAX_AGE_H go first, then the least recently used until the folder
+# fits in EXPORT_MAX_MB
+EXPORT_MAX_AGE_H = float(os.environ.get("SOBREVIDA_EXPORT_MAX_AGE_H", "24"))
+EXPORT_MAX_MB = float(os.environ.get("SOBREVIDA_EXPORT_MAX_MB", "512"))
+# the files are downloaded from the API (src/api.py), streamed from disk, so
+# the Streamlit worker never holds them in memory; links are signed with a
+# key shared through SOBREVIDA_EXPORT_SECRET or a file in EXPORT_DIR
+LINK_VALIDITY_S = 3600
+_EXPORT_NAME = re.compile(r"^[0-9a-f]{20}\.(csv|parquet)$")
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _quote(col: str) -> str:
+    return '"' + col.replace('"', '""') + '"'
+
+
+def build_query(table: str, filters: dict, group_by=None, sum_col=None):
+    """Monta o SELECT (com WHERE/GROUP BY) com os nomes de coluna do contrato."""
+    tipos = TABLES[table]
+    clauses, params = [], []
+    for col, values in filters.items():
+        if values is None or len(values) == 0:
+            continue
+        if tipos[col] == "str":
+            params.extend(str(v) for v in values)
+        else:
+            params.extend(int(v) for v in values)
+        clauses.append(f"{_quote(col)} IN ({','.join('?' * len(values))})")
+
+    if group_by:
+        keys = [_quote(c) for c in group_by]
+        if sum_col:
+            agg = f"SUM({_quote(sum_col)}) AS {_quote(sum_col)}"
+        else:
+            agg = f"COUNT(*) AS {_quote('Quantidade')}"
+        select = ", ".join(keys) + ", " + agg
+    else:
+        select = "*"
+
+    sql = f"SELECT {select} FROM {_quote(table)}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    if group_by:
+        sql += " GROUP BY " + ", ".join(keys) + " ORDER BY " + ", ".join(keys)
+    return sql, params
+
+
+def iter_query(db_path: str, sql: str, params=(), chunksize: int = CHUNK_ROWS):
+    """Lê o resultado da consulta em blocos, sem montar o DataFrame inteiro."""
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"DB não encontrado: {db_path}")
+    conn = sqlite3.connect(db_path)
+    try:
+        for chunk in pd.read_sql(sql, conn, params=list(params), chunksize=chunksize):
+            yield chunk
+    finally:
+        conn.close()
+
+
+def write_csv(chunks, path: Path) -> int:
+    rows = 0
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, header=(i == 0), index=False, quoting=csv.QUOTE_MINIMAL)
+            rows += len(chunk)
+    return rows
+
+
+def write_parquet(chunks, path: Path) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    rows = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(path, table.schema)
+            else:
+                table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+            writer.write_table(table)
+            rows += len(chunk)
+        if writer is None:
+            pq.write_table(pa.table({}), path)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet}
+
+
+def export_path(db_path: str, sql: str, params, fmt: str) -> Path:
+    """Arquivo de saída determinístico para (versão do DB, consulta, formato)."""
+    st_db = Path(db_path).stat()
+    key = json.dumps([str(db_path), st_db.st_mtime_ns, st_db.st_size, sql, list(params), fmt], default=str)
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:20]
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    return EXPORT_DIR / f"{digest}.{fmt}"
+
+
+def export_query(db_path: str, sql: str, params, fmt: str = "csv") -> Path:
+    """Gera (ou reaproveita) o arquivo de exportação da consulta.
+
+    O arquivo é escrito bloco a bloco num temporário e só então renomeado,
+    então sessões concorrentes nunca veem um arquivo pela metade.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"Formato de exportação inválido: {fmt}")
+    path = export_path(db_path, sql, params, fmt)
+    prune_exports(keep=path)
+    if path.exists():
+        path.touch()  # mtime = last use, for prune_exports
+        return path
+    fd, tmp = tempfile.mkstemp(dir=EXPORT_DIR, suffix=f".{fmt}.part")
+    os.close(fd)
+    try:
+        WRITERS[fmt](iter_query(db_path, sql, params), Path(tmp))
+        Path(tmp).replace(path)
+    finally:
+        Path(tmp).unlink(missing_ok=True)
+    return path
+
+
+def prune_exports(max_age_h: float = None, max_mb: float = None, keep: Path = None) -> int:
+    """Apaga exportações antigas de EXPORT_DIR (idade, depois tamanho total); devolve quantas.
+
+    `keep` nunca é apagado. Temporários `.part` só saem pela idade, já que
+    podem estar sendo escritos por outra sessão.
+    """
+    max_age_h = EXPORT_MAX_AGE_H if max_age_h is None else max_age_h
+    max_mb = EXPORT_MAX_MB if max_mb is None else max_mb
+    limite = time.time() - max_age_h * 3600
+    arquivos = []
+    for p in EXPORT_DIR.glob("*"):
+        if p.name.startswith("."):  # the signing key
+            continue
+        try:
+            st_p = p.stat()
+        except FileNotFoundError:  # removed by another session meanwhile
+            continue
+        arquivos.append((st_p.st_mtime, st_p.st_size, p))
+
+    removidos, total = 0, 0
+    restantes = []
+    for mtime, size, p in arquivos:
+        if p != keep and mtime < limite:
+            p.unlink(missing_ok=True)
+            removidos += 1
+        else:
+            restantes.append((mtime, size, p))
+            total += size
+
+    for mtime, size, p in sorted(restantes):
+        if total <= max_mb * 1024 * 1024:
+            break
+        if p == keep or p.name.endswith(".part"):
+            continue
+        p.unlink(missing_ok=True)
+        removidos += 1
+        total -= size
+    return removidos
+
+
+def _signing_key() -> bytes:
+    chave = os.environ.get("SOBREVIDA_EXPORT_SECRET")
+    if chave:
+        return chave.encode("utf-8")
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    path = EXPORT_DIR / ".chave"
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        return path.read_bytes()
+    with os.fdopen(fd, "wb") as f:
+        f.write(secrets.token_hex(32).encode("ascii"))
+    return path.read_bytes()
+
+
+def _signature(arquivo: str, nome: str, expira: int) -> str:
+    mensagem = f"{arquivo}\n{nome}\n{expira}".encode("utf-8")
+    return hmac.new(_signing_key(), mensagem, hashlib.sha256).hexdigest()
+
+
+def download_url(base_url: str, path: Path, nome: str) -> str:
+    """Link assinado (válido por LINK_VALIDITY_S) para baixar `path` da API com o nome `nome`."""
+    expira = int(time.time()) + LINK_VALIDITY_S
+    query = urlencode({"nome": nome, "expira": expira, "assinatura": _signature(path.name, nome, expira)})
+    return f"{base_url}/api/exportacoes/{path.name}?{query}"
+
+
+def signed_export(arquivo: str, nome: str, expira: str, assinatura: str) -> Path:
+    """Arquivo de EXPORT_DIR de um link de `download_url`.
+
+    PermissionError se o link for inválido ou tiver expirado,
+    FileNotFoundError se o arquivo já foi removido por `prune_exports`.
+    """
+    if not _EXPORT_NAME.match(arquivo):
+        raise PermissionError("arquivo inválido")
+    try:
+        prazo = int(expira)
+    except ValueError:
+        raise PermissionError("link inválido") from None
+    if not hmac.compare_digest(_signature(arquivo, nome, prazo), assinatura or ""):
+        raise PermissionError("link inválido")
+    if prazo < time.time():
+        raise PermissionError("link expirado")
+    path = EXPORT_DIR / arquivo
+    if not path.exists():
+        raise FileNotFoundError("arquivo de exportação removido; gere novamente")
+    return path
@@ -0,0 +1,122 @@
+import argparse
+import json
+import sqlite3
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.normalizacao import normalizar
+from src.schema import TABLES, write_tables
+from src.sobrevivencia import inquiry_table
+
+# Synthetic city DBs in the same schema contract the ETL scripts write
+# (categorias, heatmap, histograma; see src/schema.py). Used to run the API, the app and
+# benchmarks offline, without the real (restricted) data. POA also gets an
+# inquiry extract in the layout of vitimas4.csv, with open (censored) inquiries.
+
+TIPOS = ["AMEACA", "LESAO CORPORAL", "LESAO CORPORAL LEVE", "ESTUPRO",
+         "VIOLENCIA PSICOL CONTRA MULHER", "FEMINICIDIO"]
+CORES = ["BRANCA", "PRETA", "PARDA", "AMARELA", "INDIGENA", "N/I"]
+FAIXAS = ["12 A 17", "18 A 24", "25 A 34", "35 A 44", "45 A 59", "60+"]
+SEXOS = ["FEMININO", "MASCULINO"]
+
+BAIRROS_POA = ["CENTRO HISTORICO", "RESTINGA", "SARANDI", "RUBEM BERTA", "PARTENON",
+               "LOMBA DO PINHEIRO", "CRISTAL", "MENINO DEUS", "CIDADE BAIXA", "PETROPOLIS",
+               "BOM JESUS", "CAVALHADA", "MARIO QUINTANA", "NAVEGANTES", "FARRAPOS"]
+
+HEAT_COLS = ["TIPOVIOLENCIA", "BAIRRO", "FaixaEtária", "Sexo", "COR_PELE"]
+
+
+def bairros_from_geojson(path: str, prop: str, limit: int = None) -> list:
+    with open(path, "r", encoding="utf-8") as f:
+        gj = json.load(f)
+    # the ETL normalizes BAIRRO (no accents), so the fixture does too
+    nomes = [normalizar(feat["properties"].get(prop, "")) for feat in gj["features"]]
+    nomes = [n for n in dict.fromkeys(nomes) if n]
+    return nomes[:limit] if limit else nomes
+
+
+def synthetic_records(bairros: list, n: int, anos=(2019, 2020, 2021, 2022, 2023), seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # skewed bairro weights so top-N defaults and hotspots are not flat
+    pesos = rng.pareto(1.5, len(bairros)) + 1
+    return pd.DataFrame({
+        "TIPOVIOLENCIA": rng.choice(TIPOS, n, p=[.35, .25, .15, .1, .1, .05]),
+        "BAIRRO": rng.choice(bairros, n, p=pesos / pesos.sum()),
+        "FaixaEtária": rng.choice(FAIXAS, n),
+        "Sexo": rng.choice(SEXOS, n, p=[.9, .1]),
+        "COR_PELE": rng.choice(CORES, n),
+        "ANOFATO": rng.choice(list(anos), n),
+        "IDADE": rng.normal(34, 11, n).clip(12, 90).round(),
+    })
+
+
+def synthetic_inquiries(n: int, anos=(2019, 2020, 2021, 2022, 2023), seed: int = 0) -> pd.DataFrame:
+    """Extrato de inquéritos no formato de vitimas4.csv (datas dd/mm/aaaa, remessa vazia se aberto)."""
+    rng = np.random.default_rng(seed)
+    inicio = pd.to_datetime([f"{a}-01-01" for a in rng.choice(list(anos), n)]) + pd.to_timedelta(rng.integers(0, 365, n), "D")
+    tipo = rng.choice(TIPOS, n, p=[.35, .25, .15, .1, .1, .05])
+    medida = rng.choice(["Solicitada", "Não solicitada"], n, p=[.7, .3])
+    # slower inquiries without a protective measure request, one scale per fato
+    escala = 40 * (1 + np.searchsorted(TIPOS, tipo, sorter=np.argsort(TIPOS)) % 3) * np.where(medida == "Solicitada", 1, 2)
+    remessa = inicio + pd.to_timedelta(rng.exponential(escala).round(), "D")
+    aberto = remessa > pd.Timestamp(f"{max(anos)}-12-31")
+    return pd.DataFrame({
+        "Ig Inq": np.arange(n) + 10_000_000,
+        "Situação Instauracao ": np.where(aberto, "Instaurado", "Instaurado e Remetido"),
+        "Data Instauração": inicio.strftime("%d/%m/%Y"),
+        "Data Remessa": np.where(aberto, "", remessa.strftime("%d/%m/%Y")),
+        "Desc Fato": tipo,
+        "Med Protetiva": medida,
+    })
+
+
+def write_city_db(db_path: str, records: pd.DataFrame, inqueritos: pd.DataFrame = None):
+    heat_rows = []
+    for eixo_x, eixo_y in product(HEAT_COLS, repeat=2):
+        if eixo_x == eixo_y:
+            continue
+        temp = records.groupby([eixo_x, eixo_y, "ANOFATO"]).size().reset_index(name="Quantidade")
+        temp = temp.rename(columns={eixo_x: "X_val", eixo_y: "Y_val"})
+        temp["EixoX"] = eixo_x
+        temp["EixoY"] = eixo_y
+        heat_rows.append(temp)
+    df_heatmap = pd.concat(heat_rows, ignore_index=True)[["X_val", "Y_val", "ANOFATO", "Quantidade", "EixoX", "EixoY"]]
+    df_categorias = records.groupby(HEAT_COLS + ["ANOFATO"]).size().reset_index(name="Quantidade")
+    for col in TABLES["categorias"]:
+        if col not in df_categorias.columns:
+            df_categorias[col] = ""
+    df_hist = records[["ANOFATO", "IDADE"]]
+
+    conn = sqlite3.connect(db_path)
+    try:
+        frames = {"categorias": df_categorias, "heatmap": df_heatmap, "histograma": df_hist}
+        if inqueritos is not None:
+            frames["inqueritos"] = inqueritos
+        write_tables(conn, frames)
+    finally:
+        conn.close()
+
+
+def build_fixture_dbs(out_dir: str, n: int = 20_000, seed: int = 0) -> dict:
+    """Cria violencia.db (BH) e porto_alegre.db (POA) sintéticos em `out_dir`."""
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    bh = bairros_from_geojson("./data/bairros_ll.geojson", "BAIRRO_PAD")
+    paths = {"bh": str(out / "violencia.db"), "poa": str(out / "porto_alegre.db")}
+    write_city_db(paths["bh"], synthetic_records(bh, n, seed=seed))
+    write_city_db(paths["poa"], synthetic_records(BAIRROS_POA, n // 2, seed=seed + 1),
+                  inquiry_table([synthetic_inquiries(n // 4, seed=seed + 2)], corte="2023-12-31"))
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera DBs sintéticos de BH e POA")
+    parser.add_argument("out_dir")
+    parser.add_argument("--linhas", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for slug, path in build_fixture_dbs(args.out_dir, args.linhas, args.seed).items():
+        print(f"✔ {slug}: {path}")
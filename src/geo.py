@@ -0,0 +1,28 @@
+import copy
+
+# Geometry helpers for the choropleth payload. Plotly ships the whole
+# GeoJSON to the browser, so vertex count is most of the map's bytes.
+
+def _simplify_ring(ring, step: int, decimals):
+    if step > 1 and len(ring) > 4 * step:
+        # keep every step-th vertex, always closing the ring on the first point
+        ring = ring[:-1:step] + [ring[-1]]
+    if decimals is not None:
+        ring = [[round(x, decimals), round(y, decimals)] for x, y, *_ in ring]
+        # rounding can collapse neighbours into the same point
+        ring = [p for i, p in enumerate(ring) if i == 0 or p != ring[i - 1]]
+    return ring
+
+
+def simplify_geojson(gj: dict, step: int = 1, decimals: int = None) -> dict:
+    """Cópia do GeoJSON com menos vértices (1 a cada `step`) e coordenadas arredondadas."""
+    if step <= 1 and decimals is None:
+        return gj
+    out = copy.deepcopy(gj)
+    for feat in out["features"]:
+        geom = feat.get("geometry") or {}
+        if geom.get("type") == "Polygon":
+            geom["coordinates"] = [_simplify_ring(r, step, decimals) for r in geom["coordinates"]]
+        elif geom.get("type") == "MultiPolygon":
+            geom["coordinates"] = [[_simplify_ring(r, step, decimals) for r in poly] for poly in geom["coordinates"]]
+    return out
@@ -0,0 +1,82 @@
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src import disk_cache
+
+# Excel ingestion for the ETL scripts.
+#
+# Parsing the source .xlsx files is the slowest step of every ETL run. Each
+# workbook is read once (openpyxl read-only mode, row by row) and stored as a
+# Parquet file named after the workbook's content hash; later runs read the
+# Parquet directly and only re-parse the .xlsx when its bytes change.
+
+XLSX_CACHE_DIR = Path(disk_cache.CACHE_DIR or Path(__file__).resolve().parents[1] / ".cache") / "xlsx"
+
+
+def file_hash(path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloco in iter(lambda: f.read(chunk_size), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def _stream_workbook(path, sheet=None, header: int = 0) -> pd.DataFrame:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.worksheets[0]
+        linhas = ws.iter_rows(values_only=True)
+        for _ in range(header):
+            next(linhas, None)
+        cabecalho = next(linhas, ())
+        dados = [linha for linha in linhas if any(v is not None for v in linha)]
+    finally:
+        wb.close()
+
+    colunas = [str(c) if c is not None else f"Unnamed: {i}" for i, c in enumerate(cabecalho)]
+    largura = len(colunas)
+    dados = [tuple(linha[:largura]) + (None,) * (largura - len(linha)) for linha in dados]
+    df = pd.DataFrame(dados, columns=colunas)
+
+    # Parquet needs one type per column; Excel columns often mix numbers and text
+    for col in df.columns[df.dtypes == object]:
+        if pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed"):
+            df[col] = df[col].map(lambda v: v if v is None else str(v))
+    return df
+
+
+def read_workbook(path, sheet=None, header: int = 0) -> pd.DataFrame:
+    """Lê a planilha via cache Parquet indexado pelo hash do conteúdo do arquivo.
+
+    `header` é o índice da linha de cabeçalho, como em `pd.read_excel`.
+    """
+    path = Path(path)
+    prefixo = f"{path.stem}-{sheet or 'primeira'}-h{header}-"
+    cache = XLSX_CACHE_DIR / f"{prefixo}{file_hash(path)[:24]}.parquet"
+    if cache.exists():
+        return _missing_as_nan(pd.read_parquet(cache))
+
+    df = _stream_workbook(path, sheet, header)
+
+    XLSX_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = cache.with_name(f"{cache.stem}.{os.getpid()}.tmp")
+    df.to_parquet(tmp, index=False)
+    tmp.replace(cache)
+    # drop caches of older versions of the same workbook
+    for antigo in XLSX_CACHE_DIR.glob(f"{prefixo}*.parquet"):
+        if antigo != cache:
+            antigo.unlink(missing_ok=True)
+    return _missing_as_nan(df)
+
+
+def _missing_as_nan(df: pd.DataFrame) -> pd.DataFrame:
+    # same missing marker as pd.read_excel (NaN, not None) in text columns
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
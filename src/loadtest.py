@@ -0,0 +1,263 @@
+import argparse
+import csv
+import multiprocessing
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+# Load test: N concurrent dashboard sessions against the synthetic DBs.
+#
+#   python -m src.loadtest --sessoes 1 2 4 8 --rotulo v1.4 --saida capacidade.csv
+#
+# Each session is a streamlit AppTest of app.py (logged in as a test user
+# from fixture secrets) running a random script of the interactions below,
+# against the synthetic DBs of src/fixture_db.py. AppTest swaps
+# process-global state on every run (the Runtime instance, st.secrets), so
+# sessions can't share a process: each one is its own process, like one
+# Streamlit worker per session, and they really run at the same time. The
+# workers share the disk cache (src/disk_cache.py) the way workers on one
+# host do; their in-memory caches are warmed by one untimed run before the
+# common start.
+#
+# AppTest never mounts the screen-size component (src/responsive.py), so each
+# session is given a width: --fracao-celular of them get a phone width and
+# the "small" profile, the rest a desktop width and the "full" one.
+#
+# Per level of concurrency it reports p50/p95/p99 latency per interaction
+# (overall and per profile), throughput and the RSS of each worker (mean, max
+# and sum); --saida appends the rows to a CSV, one capacity curve per
+# --rotulo. A CSV written with other columns is refused, not appended to.
+
+ROOT = Path(__file__).resolve().parents[1]
+TEST_USER = ("carga", "carga")
+INTERACOES = ["trocar_cidade", "mudar_anos", "adicionar_bairros", "trocar_eixos"]
+LARGURAS = {"small": 390, "full": 1920}
+CSV_COLUMNS = ["rotulo", "data", "sessoes", "fracao_celular", "interacao", "n", "p50_ms", "p95_ms", "p99_ms",
+               "vazao_rps", "rss_mb", "rss_max_mb", "rss_total_mb", "erros"]
+
+def _widget(lista, label):
+    return next(w for w in lista if w.label == label)
+
+
+def trocar_cidade(at, rng):
+    radio = _widget(at.sidebar.radio, "Fonte dos dados")
+    radio.set_value(next(o for o in radio.options if o != radio.value))
+
+
+def mudar_anos(at, rng):
+    anos = _widget(at.sidebar.multiselect, "Anos")
+    k = int(rng.integers(1, min(3, len(anos.options)) + 1))
+    anos.set_value(list(rng.choice(anos.options, k, replace=False)))
+
+
+def adicionar_bairros(at, rng):
+    bairros = _widget(at.sidebar.multiselect, "Bairros")
+    livres = [b for b in bairros.options if b not in bairros.value]
+    if livres:
+        novos = rng.choice(livres, min(len(livres), int(rng.integers(1, 4))), replace=False)
+        bairros.set_value(list(bairros.value) + list(novos))
+
+
+def trocar_eixos(at, rng):
+    eixo_x = _widget(at.sidebar.selectbox, "Eixo X")
+    eixo_y = _widget(at.sidebar.selectbox, "Eixo Y")
+    x, y = eixo_x.value, eixo_y.value
+    eixo_x.set_value(y)
+    eixo_y.set_value(x)
+
+
+ACOES = {nome: globals()[nome] for nome in INTERACOES}
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        import resource  # peak, not current, where /proc is missing
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / 2 ** 20 if sys.platform == "darwin" else maxrss / 1024
+
+
+def new_session(timeout: float, perfil: str):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=timeout)
+    at.secrets["auth"] = {TEST_USER[0]: TEST_USER[1]}
+    at.session_state["logged"] = True
+    at.session_state["user"] = TEST_USER[0]
+    # what the screen-size component would report from the browser
+    at.session_state["screen_width"] = LARGURAS[perfil]
+    return at
+
+
+def session_profiles(sessoes: int, fracao_celular: float) -> list:
+    """Perfil de cada sessão: as primeiras round(fracao * sessoes) são celulares."""
+    celulares = int(round(fracao_celular * sessoes))
+    return ["small"] * celulares + ["full"] * (sessoes - celulares)
+
+
+def run_session(seed: int, perfil: str, passos: int, timeout: float, inicio, resultados):
+    """Roda um roteiro aleatório num processo próprio; envia ({medidas, rss_mb}) para `resultados`."""
+    os.chdir(ROOT)
+    rng = np.random.default_rng(seed)
+    medidas = []
+    try:
+        new_session(timeout, perfil).run()  # untimed: imports and in-memory caches of this worker
+    finally:
+        inicio.wait()
+    at = None
+
+    def medir(nome, acao=None):
+        t0 = time.perf_counter()
+        erro = None
+        try:
+            if acao:
+                acao(at, rng)
+            at.run()
+            if at.exception:
+                erro = at.exception[0].message
+        except Exception as e:
+            erro = repr(e)
+        medidas.append((nome, perfil, time.perf_counter() - t0, erro))
+
+    at = new_session(timeout, perfil)
+    medir("abrir")
+    for nome in rng.choice(INTERACOES, passos):
+        medir(str(nome), ACOES[nome])
+    resultados.put({"medidas": medidas, "rss_mb": rss_mb()})
+
+
+def run_level(sessoes: int, passos: int, timeout: float, seed: int, fracao_celular: float) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    inicio = ctx.Barrier(sessoes + 1)
+    resultados = ctx.Queue()
+    workers = [ctx.Process(target=run_session, args=(seed + i, perfil, passos, timeout, inicio, resultados))
+               for i, perfil in enumerate(session_profiles(sessoes, fracao_celular))]
+    for w in workers:
+        w.start()
+    # every worker warmed up (spawn + imports + one run): the clock starts for all of them together
+    inicio.wait(timeout + 60)
+    t0 = time.perf_counter()
+    recebidos = []
+    while len(recebidos) < sessoes:
+        try:
+            recebidos.append(resultados.get(timeout=1))
+        except queue.Empty:
+            if not any(w.is_alive() for w in workers):
+                break
+    duracao = time.perf_counter() - t0
+    for w in workers:
+        w.join()
+    perdidos = sessoes - len(recebidos)
+    return {
+        "medidas": [m for r in recebidos for m in r["medidas"]] + [("abrir", "?", duracao, "worker morreu")] * perdidos,
+        "duracao": duracao,
+        "rss_mb": [r["rss_mb"] for r in recebidos],
+    }
+
+
+def summarize(sessoes: int, nivel: dict, rotulo: str, fracao_celular: float) -> list:
+    por_interacao = {}
+    for nome, perfil, segundos, erro in nivel["medidas"]:
+        por_interacao.setdefault(nome, []).append((segundos, erro))
+        por_interacao.setdefault(f"todas ({perfil})", []).append((segundos, erro))
+    por_interacao["todas"] = [(s, e) for _, _, s, e in nivel["medidas"]]
+
+    rss = nivel["rss_mb"] or [np.nan]
+    linhas = []
+    for nome, valores in por_interacao.items():
+        ms = np.array([s for s, _ in valores]) * 1000
+        p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+        linhas.append({
+            "rotulo": rotulo, "data": date.today().isoformat(), "sessoes": sessoes,
+            "fracao_celular": fracao_celular, "interacao": nome,
+            "n": len(valores), "p50_ms": round(p50, 1), "p95_ms": round(p95, 1), "p99_ms": round(p99, 1),
+            "vazao_rps": round(len(nivel["medidas"]) / nivel["duracao"], 2),
+            "rss_mb": round(float(np.mean(rss)), 1), "rss_max_mb": round(float(np.max(rss)), 1),
+            "rss_total_mb": round(float(np.sum(rss)), 1), "erros": sum(e is not None for _, e in valores),
+        })
+    return linhas
+
+
+def print_table(linhas: list):
+    cols = ["sessoes", "interacao", "n", "p50_ms", "p95_ms", "p99_ms", "vazao_rps", "rss_mb", "rss_max_mb",
+            "rss_total_mb", "erros"]
+    print("  ".join(f"{c:>17}" if c == "interacao" else f"{c:>9}" for c in cols))
+    for linha in linhas:
+        print("  ".join(f"{linha[c]:>17}" if c == "interacao" else f"{linha[c]:>9}" for c in cols))
+
+
+def check_csv(path: str):
+    """Falha (SystemExit) se `path` já existe com outras colunas: as linhas ficariam desalinhadas."""
+    if not Path(path).exists() or Path(path).stat().st_size == 0:
+        return
+    with open(path, newline="", encoding="utf-8") as f:
+        cabecalho = next(csv.reader(f), [])
+    if cabecalho != CSV_COLUMNS:
+        sys.exit(f"✘ {path} tem as colunas {cabecalho}, esperado {CSV_COLUMNS}; use outro --saida")
+
+
+def append_csv(path: str, linhas: list):
+    check_csv(path)
+    novo = not Path(path).exists() or Path(path).stat().st_size == 0
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        if novo:
+            writer.writeheader()
+        writer.writerows(linhas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do dashboard com sessões concorrentes")
+    parser.add_argument("--sessoes", type=int, nargs="+", default=[1, 2, 4, 8], help="níveis de concorrência")
+    parser.add_argument("--passos", type=int, default=8, help="interações por sessão")
+    parser.add_argument("--linhas", type=int, default=20_000, help="registros do DB sintético de BH")
+    parser.add_argument("--timeout", type=float, default=120, help="limite por rerun (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rotulo", default="", help="identifica a execução na curva (ex.: versão)")
+    parser.add_argument("--saida", help="CSV onde as linhas da curva de capacidade são acrescentadas")
+    parser.add_argument("--fracao-celular", type=float, default=0.5,
+                        help="fração das sessões com largura de celular (perfil small); o resto é desktop (full)")
+    args = parser.parse_args(argv)
+    if not 0 <= args.fracao_celular <= 1:
+        parser.error("--fracao-celular deve estar entre 0 e 1")
+    if args.saida:
+        check_csv(args.saida)  # before the run, not after minutes of load
+
+    # the app reads DB paths from src.config at import time, so the fixture
+    # DBs have to be in the environment before the workers start
+    from src.fixture_db import build_fixture_dbs
+
+    os.chdir(ROOT)  # app.py and the fixtures use paths relative to the repo root
+    tmp = tempfile.mkdtemp(prefix="sobrevida_carga_")
+    try:
+        dbs = build_fixture_dbs(tmp, args.linhas, args.seed)
+        os.environ["SOBREVIDA_BH_DB"] = dbs["bh"]
+        os.environ["SOBREVIDA_POA_DB"] = dbs["poa"]
+        os.environ.setdefault("SOBREVIDA_CACHE_DIR", str(Path(tmp) / "cache"))
+
+        # warm-up run so level 1 doesn't fill the shared disk cache alone
+        run_level(1, len(INTERACOES), args.timeout, args.seed, args.fracao_celular)
+
+        linhas = []
+        for sessoes in args.sessoes:
+            nivel = run_level(sessoes, args.passos, args.timeout, args.seed + 1000 * sessoes, args.fracao_celular)
+            linhas.extend(summarize(sessoes, nivel, args.rotulo, args.fracao_celular))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    print_table(linhas)
+    if args.saida:
+        append_csv(args.saida, linhas)
+        print(f"✔ curva de capacidade: {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
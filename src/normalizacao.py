@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+# Text normalization shared by the ETL scripts and the app.
+#
+# Everything goes through one str.translate table (accents -> ASCII) plus a
+# split/join for whitespace, and Series are normalized over their distinct
+# values only: pd.factorize gives the codes, each unique value is normalized
+# once and the result is mapped back with a single take. Cost depends on the
+# number of distinct values, not on the number of rows.
+
+_COM_ACENTO = "ÁÀÂÃÄÅáàâãäåÉÈÊËéèêëÍÌÎÏíìîïÓÒÔÕÖóòôõöÚÙÛÜúùûüÇçÑñÝýÿ"
+_SEM_ACENTO = "AAAAAAaaaaaaEEEEeeeeIIIIiiiiOOOOOoooooUUUUuuuuCcNnYyy"
+TABELA_ACENTOS = str.maketrans(_COM_ACENTO, _SEM_ACENTO)
+
+
+def normalizar(texto, caixa: str = "upper", acentos: bool = False) -> str:
+    """Remove acentos (se `acentos=False`), colapsa espaços e ajusta a caixa."""
+    texto = str(texto)
+    if not acentos:
+        texto = texto.translate(TABELA_ACENTOS)
+    texto = " ".join(texto.split())
+    if caixa == "upper":
+        return texto.upper()
+    if caixa == "lower":
+        return texto.lower()
+    return texto
+
+
+def normalizar_serie(serie: pd.Series, caixa: str = "upper", acentos: bool = False, manter_na: bool = True) -> pd.Series:
+    """Normaliza uma coluna de texto aplicando `normalizar` só aos valores distintos.
+
+    Com `manter_na=False` os ausentes viram o texto "NAN", como o antigo
+    `.astype(str).str.upper()` dos scripts de ETL.
+    """
+    codes, uniques = pd.factorize(serie, use_na_sentinel=manter_na)
+    # the trailing NaN is what code -1 (missing) picks up
+    normalizados = np.array([normalizar(u, caixa, acentos) for u in uniques] + [np.nan], dtype=object)
+    return pd.Series(normalizados[codes], index=serie.index, name=serie.name)
+
+
+def normalizar_colunas(colunas) -> list:
+    """Cabeçalhos no padrão do ETL: minúsculas, sem acentos, espaços viram '_'."""
+    return [normalizar(c, caixa="lower").replace(" ", "_") for c in colunas]
@@ -1,49 +1,39 @@
+from pathlib import Path
+
 import streamlit as st
+import streamlit.components.v1 as components
 
-def detect_screen_size():
-    st.markdown("""
-        <script>
-            function sendScreenSize() {
-                const width = window.innerWidth;
-                const height = window.innerHeight;
-                window.parent.postMessage(
-                    {isStreamlitMessage: true, width: width, height: height},
-                    "*"
-                );
-            }
-            window.onload = sendScreenSize;
-            window.onresize = sendScreenSize;
-        </script>
-    """, unsafe_allow_html=True)
+SMALL_SCREEN_MAX_WIDTH = 1024
 
-def screen_size_listener():
-    message = st.experimental_get_query_params()
-    return message
+# Rendering profiles: how much detail each panel ships to the browser.
+#   geo_step/geo_decimals -> choropleth vertex decimation / coordinate rounding
+#   heat_top_n            -> categories per heatmap axis
+#   hist_bins/pre_binned  -> age histogram bins, computed server-side when pre_binned
+#   layout                -> forced layout (None keeps the user's choice)
+PROFILES = {
+    "full": {"nome": "full", "geo_step": 1, "geo_decimals": None, "heat_top_n": 5,
+             "hist_bins": 20, "pre_binned": False, "layout": None, "map_height": 600},
+    "small": {"nome": "small", "geo_step": 4, "geo_decimals": 4, "heat_top_n": 3,
+              "hist_bins": 10, "pre_binned": True, "layout": "Vertical", "map_height": 420},
+}
 
-def is_small_screen():
-    return st.session_state.get("screen_width", 1920) <= 1024
-    
-def sync_screen_size():
-    detect_screen_size()
+# A bidirectional component (src/frontend/screen_size) sends the window width
+# as its value, so the script reruns as soon as the width is known and again
+# only when it crosses SMALL_SCREEN_MAX_WIDTH. Until the first report the
+# cheap "small" profile is used, so a phone never renders the full one.
+_screen_size = components.declare_component(
+    "screen_size", path=str(Path(__file__).parent / "frontend" / "screen_size"))
 
-    st.markdown("""
-        <script>
-            window.addEventListener("message", (event) => {
-                if (event.data && event.data.width) {
-                    const width = event.data.width;
-                    const height = event.data.height;
+def is_small_screen():
+    width = st.session_state.get("screen_width")
+    return width is None or width <= SMALL_SCREEN_MAX_WIDTH
 
-                    const data = {
-                        width: width,
-                        height: height,
-                    };
+def sync_screen_size():
+    width = st.session_state.get("screen_width")
+    atual = None if width is None else width <= SMALL_SCREEN_MAX_WIDTH
+    reported = _screen_size(limite=SMALL_SCREEN_MAX_WIDTH, atual=atual, key="screen_size", default=None)
+    if reported:
+        st.session_state["screen_width"] = int(reported)
 
-                    fetch("/_stcore/setComponentValue", {
-                        method: "POST",
-                        body: JSON.stringify(data),
-                        headers: {"Content-Type": "application/json"},
-                    });
-                }
-            });
-        </script>
-    """, unsafe_allow_html=True)
+def render_profile() -> dict:
+    return PROFILES["small"] if is_small_screen() else PROFILES["full"]
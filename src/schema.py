@@ -0,0 +1,161 @@
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.normalizacao import normalizar_serie
+
+# Schema contract between the ETL scripts and the dashboard.
+#
+# Every city DB stores the tables below with exactly these column names and
+# dtypes, plus a `schema_meta` table stamping the version it was written
+# with. The ETL scripts call `write_tables`, which conforms (casts and
+# normalizes text) and validates before writing; the app only calls
+# `check_db_schema` and reads the tables as they are.
+#
+# `catalogo` is derived from categorias by `write_tables` itself: one row per
+# (dimension, value, year) with its total and the value's overall rank in
+# its dimension, enough to build every sidebar widget without the fact table.
+#
+# `inqueritos` is optional: only cities with the police inquiry extracts
+# (POA) have it. One row per inquiry × fato, the processing time already
+# reduced to days since the opening (see src/sobrevivencia.py).
+
+SCHEMA_VERSION = 3
+META_TABLE = "schema_meta"
+
+TABLES = {
+    "categorias": {
+        "TIPOVIOLENCIA": "str", "BAIRRO": "str", "FaixaEtária": "str", "Sexo": "str", "COR_PELE": "str",
+        "Escolaridade": "str", "RelaçãoVítimaAutor": "str", "TipoEnvolvimento": "str", "GrauLesão": "str",
+        "ANOFATO": "int", "Quantidade": "int",
+    },
+    "heatmap": {
+        "X_val": "str", "Y_val": "str", "ANOFATO": "int", "Quantidade": "int", "EixoX": "str", "EixoY": "str",
+    },
+    "histograma": {
+        "ANOFATO": "int", "IDADE": "float",
+    },
+    "catalogo": {
+        "dimensao": "str", "valor": "str", "ANOFATO": "int", "Quantidade": "int", "posicao": "int",
+    },
+    "inqueritos": {
+        "DESC_FATO": "str", "MED_PROTETIVA": "str", "ANOINSTAURACAO": "int", "DIAS": "int", "REMETIDO": "int",
+    },
+}
+FACT_TABLES = ["categorias", "heatmap", "histograma"]
+OPTIONAL_TABLES = ["inqueritos"]
+DIMENSOES = [col for col, tipo in TABLES["categorias"].items() if tipo == "str"]
+
+_DTYPES = {"str": np.dtype(object), "int": np.dtype("int64"), "float": np.dtype("float64")}
+
+
+class SchemaError(ValueError):
+    pass
+
+
+def conform(df: pd.DataFrame, table: str) -> pd.DataFrame:
+    """Seleciona/ordena as colunas do contrato e aplica os tipos finais."""
+    colunas = TABLES[table]
+    faltando = [c for c in colunas if c not in df.columns]
+    if faltando:
+        raise SchemaError(f"{table}: colunas ausentes {faltando}")
+    out = df[list(colunas)].copy()
+    for col, tipo in colunas.items():
+        if tipo == "str":
+            out[col] = normalizar_serie(out[col], acentos=True, manter_na=False)
+        elif tipo == "int":
+            # null counts as 0; anything non-null must be an integer
+            numeros = _numeric(out[col], table, col)
+            fracao = numeros.notna() & (numeros % 1 != 0)
+            if fracao.any():
+                raise SchemaError(f"{table}.{col}: {int(fracao.sum())} valores não inteiros, "
+                                  f"ex.: {out[col][fracao].unique()[:5].tolist()}")
+            out[col] = numeros.fillna(0).astype("int64")
+        else:
+            out[col] = _numeric(out[col], table, col).astype("float64")
+    return out
+
+
+def _numeric(serie: pd.Series, table: str, col: str) -> pd.Series:
+    """pd.to_numeric que falha (SchemaError) em vez de virar NaN quando um valor não nulo não é número."""
+    numeros = pd.to_numeric(serie, errors="coerce")
+    vazio = serie.isna() | serie.astype("string").str.strip().eq("").fillna(True)
+    invalidos = numeros.isna() & ~vazio
+    if invalidos.any():
+        raise SchemaError(f"{table}.{col}: {int(invalidos.sum())} valores não numéricos, "
+                          f"ex.: {serie[invalidos].unique()[:5].tolist()}")
+    return numeros
+
+
+def validate_frame(df: pd.DataFrame, table: str):
+    colunas = TABLES[table]
+    if list(df.columns) != list(colunas):
+        raise SchemaError(f"{table}: colunas {list(df.columns)} != contrato {list(colunas)}")
+    for col, tipo in colunas.items():
+        if df[col].dtype != _DTYPES[tipo]:
+            raise SchemaError(f"{table}.{col}: dtype {df[col].dtype} != {tipo}")
+
+
+def build_catalog(categorias: pd.DataFrame) -> pd.DataFrame:
+    """Catálogo das dimensões: total por (dimensão, valor, ano) e posição geral do valor (1 = maior)."""
+    partes = []
+    for col in DIMENSOES:
+        por_ano = categorias.groupby([col, "ANOFATO"])["Quantidade"].sum().reset_index()
+        # stable sort over the value-sorted groups: same order (ties included) as nlargest
+        total = categorias.groupby(col)["Quantidade"].sum().sort_values(ascending=False, kind="stable")
+        posicao = pd.Series(np.arange(1, len(total) + 1), index=total.index)
+        partes.append(pd.DataFrame({
+            "dimensao": col, "valor": por_ano[col], "ANOFATO": por_ano["ANOFATO"],
+            "Quantidade": por_ano["Quantidade"], "posicao": por_ano[col].map(posicao),
+        }))
+    catalogo = pd.concat(partes, ignore_index=True)
+    return catalogo.astype({"dimensao": object, "valor": object, "ANOFATO": "int64",
+                            "Quantidade": "int64", "posicao": "int64"})
+
+
+def write_tables(conn: sqlite3.Connection, frames: dict):
+    """Grava as tabelas do contrato (conformadas e validadas), o catálogo e o carimbo de versão."""
+    for table in FACT_TABLES:
+        if table not in frames:
+            raise SchemaError(f"tabela ausente: {table}")
+    frames = {table: conform(df, table) if table in FACT_TABLES + OPTIONAL_TABLES else df
+              for table, df in frames.items()}
+    frames["catalogo"] = build_catalog(frames["categorias"])
+    for table, df in frames.items():
+        if table in TABLES:
+            validate_frame(df, table)
+        df.to_sql(table, conn, if_exists="replace", index=False)
+
+    meta = pd.DataFrame(
+        [(SCHEMA_VERSION, table, col, tipo) for table, cols in TABLES.items() for col, tipo in cols.items()],
+        columns=["versao", "tabela", "coluna", "tipo"],
+    )
+    meta.to_sql(META_TABLE, conn, if_exists="replace", index=False)
+
+
+def check_db_schema(db_path: str):
+    """Falha rápido se o DB não foi gravado com a versão atual do contrato."""
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"DB não encontrado: {db_path}")
+    conn = sqlite3.connect(db_path)
+    try:
+        try:
+            meta = pd.read_sql(f"SELECT versao, tabela, coluna, tipo FROM {META_TABLE}", conn)
+        except Exception:
+            raise SchemaError(f"{db_path}: sem {META_TABLE}; gere o DB novamente com o ETL atual") from None
+        versoes = set(meta["versao"])
+        if versoes != {SCHEMA_VERSION}:
+            raise SchemaError(f"{db_path}: schema versão {sorted(versoes)}, esperado {SCHEMA_VERSION}")
+        for table, colunas in TABLES.items():
+            gravadas = meta.loc[meta["tabela"] == table, ["coluna", "tipo"]]
+            if list(gravadas.itertuples(index=False, name=None)) != list(colunas.items()):
+                raise SchemaError(f"{db_path}: tabela {table} fora do contrato")
+            reais = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+            if not reais and table in OPTIONAL_TABLES:
+                continue
+            if reais != list(colunas):
+                raise SchemaError(f"{db_path}: colunas de {table} {reais} != contrato {list(colunas)}")
+    finally:
+        conn.close()
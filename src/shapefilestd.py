@@ -1,12 +1,17 @@
+import sys
 import sqlite3
 import pandas as pd
 import geopandas as gpd
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.normalizacao import normalizar_serie
 
 # ===========================
 # 1. CARREGAR SHAPEFILE
 # ===========================
 gdf = gpd.read_file("BAIRRO_POPULAR.shp")   # ajuste o nome se necessário
-gdf["NOME"] = gdf["NOME"].str.upper().str.strip()
+gdf["NOME"] = normalizar_serie(gdf["NOME"])
 
 # ===========================
 # 2. CARREGAR DADOS DO BANCO
@@ -19,7 +24,7 @@ df = pd.read_sql("SELECT * FROM categorias", conn)
 
 conn.close()
 
-df["BAIRRO"] = df["BAIRRO"].astype(str).str.upper().str.strip()
+df["BAIRRO"] = normalizar_serie(df["BAIRRO"], manter_na=False)
 
 casos_bairro = (
     df.groupby("BAIRRO")["Quantidade"]
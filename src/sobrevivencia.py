@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+from src.aggregations import read_table, table_columns
+from src.normalizacao import normalizar_colunas, normalizar_serie
+from src.schema import check_db_schema, validate_frame
+
+# Inquiry processing times (Kaplan–Meier).
+#
+# The event is the remittance of the inquiry (`Data Remessa`); an inquiry
+# not remitted yet is censored at the extract's cut-off date. The ETL reduces
+# the dates to one day offset per inquiry × fato (`inquiry_table`, table
+# `inqueritos` in src/schema.py), so the app never parses dates.
+#
+# All groups are estimated at once: one sort over the (group, day) key, one
+# bincount for events and exits, and survival, number at risk and Greenwood
+# variance as cumulative sums restarted at each group boundary. The cost is
+# one pass over the selected rows whatever the number of strata.
+
+# label shown in the panel -> column of the inqueritos table
+ESTRATOS = {
+    "Tipo de fato": "DESC_FATO",
+    "Medida protetiva": "MED_PROTETIVA",
+    "Ano de instauração": "ANOINSTAURACAO",
+}
+# inquiry-level value when its rows disagree: a request by any victim wins
+_MED_ORDEM = ["NAO SE APLICA", "NAO SOLICITADA", "SOLICITADA"]
+Z_95 = 1.959964
+
+
+def _datas(serie: pd.Series) -> pd.Series:
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    return pd.to_datetime(serie, format="%d/%m/%Y", errors="coerce")
+
+
+def inquiry_table(frames, corte=None) -> pd.DataFrame:
+    """Tabela `inqueritos` a partir dos extratos de vítimas/agressores (uma linha por inquérito × fato).
+
+    `corte` é a data do extrato (padrão: a data mais recente dos arquivos);
+    inquéritos sem remessa são censurados nela.
+    """
+    df = pd.concat([f.set_axis(normalizar_colunas(f.columns), axis=1) for f in frames], ignore_index=True)
+    inicio = _datas(df["data_instauracao"])
+    remessa = _datas(df["data_remessa"])
+    remetido = remessa.notna()
+    if "situacao_instauracao" in df.columns:
+        remetido &= normalizar_serie(df["situacao_instauracao"], manter_na=False).str.contains("REMETID")
+    corte = pd.Timestamp(corte) if corte is not None else max(inicio.max(), remessa.max())
+
+    med = normalizar_serie(df["med_protetiva"], manter_na=False) if "med_protetiva" in df.columns else ""
+    base = pd.DataFrame({
+        "inquerito": df["ig_inq"].astype("string").fillna(""),
+        "DESC_FATO": df["desc_fato"].fillna(""),
+        "med": pd.Categorical(med, categories=_MED_ORDEM, ordered=True).codes,
+        "inicio": inicio,
+        "fim": remessa.where(remetido, corte),
+        "REMETIDO": remetido.astype("int64"),
+    })[inicio.notna()]
+
+    # the victim and the suspect of an inquiry are separate rows in the extracts
+    por_inq = base.groupby(["inquerito", "DESC_FATO"], sort=False).agg(
+        med=("med", "max"), inicio=("inicio", "min"), fim=("fim", "max"), REMETIDO=("REMETIDO", "min"),
+    ).reset_index()
+    por_inq["DIAS"] = (por_inq["fim"] - por_inq["inicio"]).dt.days
+    por_inq = por_inq[por_inq["DIAS"] >= 0]
+    return pd.DataFrame({
+        "DESC_FATO": por_inq["DESC_FATO"],
+        "MED_PROTETIVA": np.array(_MED_ORDEM + [""], dtype=object)[por_inq["med"].to_numpy()],
+        "ANOINSTAURACAO": por_inq["inicio"].dt.year,
+        "DIAS": por_inq["DIAS"],
+        "REMETIDO": por_inq["REMETIDO"],
+    }).reset_index(drop=True)
+
+
+def read_inquiries(db_path: str):
+    """Tabela `inqueritos` em tipos compactos (estratos categóricos); None se a cidade não tiver."""
+    check_db_schema(db_path)
+    if not table_columns(db_path, "inqueritos"):
+        return None
+    inq = read_table(db_path, "inqueritos")
+    validate_frame(inq, "inqueritos")
+    return inq.astype({"DESC_FATO": "category", "MED_PROTETIVA": "category", "ANOINSTAURACAO": "category",
+                       "DIAS": "int32", "REMETIDO": "bool"})
+
+
+def _por_grupo(valores: np.ndarray, inicio: np.ndarray, segmento: np.ndarray) -> np.ndarray:
+    """Soma acumulada de `valores` reiniciada no começo de cada grupo."""
+    acum = np.cumsum(valores)
+    return acum - (acum - valores)[inicio][segmento]
+
+
+def kaplan_meier(dias, evento, grupo, n_grupos: int) -> pd.DataFrame:
+    """Curvas de todos os grupos: uma linha por (grupo, dia com saída).
+
+    `grupo` são códigos 0..n_grupos-1. Colunas: grupo, dias, em_risco,
+    eventos, censurados, sobrevida e o intervalo de 95% (Greenwood).
+    """
+    dias = np.asarray(dias, dtype=np.int64)
+    evento = np.asarray(evento, dtype=bool)
+    grupo = np.asarray(grupo, dtype=np.int64)
+    if dias.size == 0:
+        return pd.DataFrame(columns=["grupo", "dias", "em_risco", "eventos", "censurados",
+                                     "sobrevida", "ic_inf", "ic_sup"])
+
+    # one key per (group, day): a single sort orders groups and times together
+    passo = int(dias.max()) + 1
+    chaves, pos = np.unique(grupo * passo + dias, return_inverse=True)
+    saidas = np.bincount(pos)
+    eventos = np.bincount(pos, weights=evento).astype(np.int64)
+    g, t = chaves // passo, chaves % passo
+
+    inicio = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+    segmento = np.cumsum(np.r_[True, g[1:] != g[:-1]]) - 1
+    # at risk: group size minus everyone who left at earlier days of the group
+    em_risco = np.bincount(grupo, minlength=n_grupos)[g] - (_por_grupo(saidas, inicio, segmento) - saidas)
+
+    # product-limit as a sum of logs; a step where everyone left drops S to 0
+    zera = eventos == em_risco
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_s = np.where(zera, 0.0, np.log1p(-eventos / em_risco))
+        greenwood = np.where(zera, 0.0, eventos / (em_risco * (em_risco - eventos)))
+    sobrevida = np.where(_por_grupo(zera.astype(np.int64), inicio, segmento) > 0, 0.0,
+                         np.exp(_por_grupo(log_s, inicio, segmento)))
+    ep = sobrevida * np.sqrt(_por_grupo(greenwood, inicio, segmento))
+
+    return pd.DataFrame({
+        "grupo": g, "dias": t, "em_risco": em_risco, "eventos": eventos, "censurados": saidas - eventos,
+        "sobrevida": sobrevida,
+        "ic_inf": np.clip(sobrevida - Z_95 * ep, 0, 1), "ic_sup": np.clip(sobrevida + Z_95 * ep, 0, 1),
+    })
+
+
+def median_days(curvas: pd.DataFrame, n_grupos: int) -> np.ndarray:
+    """Primeiro dia com sobrevida <= 0,5 por grupo (NaN se a curva não chega lá)."""
+    mediana = np.full(n_grupos, np.nan)
+    abaixo = curvas[curvas["sobrevida"] <= 0.5]
+    grupos, primeiro = np.unique(abaixo["grupo"].to_numpy(dtype=np.int64), return_index=True)
+    mediana[grupos] = abaixo["dias"].to_numpy(dtype=float)[primeiro]
+    return mediana
+
+
+def survival_curves(inq: pd.DataFrame, por: str, filtros: dict = None, min_casos: int = 1):
+    """(curvas, resumo) de `inq` estratificado por `por`, após os filtros {coluna: valores | None}.
+
+    Estratos com menos de `min_casos` inquéritos ficam de fora.
+    """
+    mask = np.ones(len(inq), dtype=bool)
+    for col, valores in (filtros or {}).items():
+        if valores is not None:
+            mask &= inq[col].isin(valores).to_numpy()
+    sub = inq[mask]
+
+    estrato = sub[por].astype("category")
+    codigos = estrato.cat.codes.to_numpy()
+    rotulos = estrato.cat.categories
+    n = np.bincount(codigos, minlength=len(rotulos))
+    validos = n >= max(min_casos, 1)
+    linhas = validos[codigos]
+
+    curvas = kaplan_meier(sub["DIAS"].to_numpy()[linhas], sub["REMETIDO"].to_numpy()[linhas],
+                          codigos[linhas], len(rotulos))
+    remetidos = np.bincount(codigos, weights=sub["REMETIDO"].to_numpy(), minlength=len(rotulos)).astype(np.int64)
+    resumo = pd.DataFrame({
+        "estrato": rotulos, "inqueritos": n, "remetidos": remetidos, "censurados": n - remetidos,
+        "mediana_dias": median_days(curvas, len(rotulos)),
+    })[validos].reset_index(drop=True)
+    curvas["grupo"] = np.asarray(rotulos)[curvas["grupo"].to_numpy()] if len(curvas) else []
+    return curvas.rename(columns={"grupo": "estrato"}), resumo
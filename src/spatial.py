@@ -0,0 +1,184 @@
+import json
+import os
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from src import disk_cache
+from src.aggregations import dataset_version
+from src.normalizacao import normalizar
+
+# Spatial autocorrelation over the bairro polygons.
+#
+# The queen-contiguity matrix (bairros sharing at least one vertex) is built
+# once per geometry version and stored as CSR arrays (indptr/indices) in an
+# .npz next to the shared cache. All statistics are sparse products done with
+# a cumulative sum over the CSR rows, which works the same for a vector
+# (n,) and for a block of permutations (n, P), so permutation tests are a
+# single vectorized pass instead of a Python loop. Gi* p-values use
+# conditional permutations (x_i fixed, neighbours drawn from the other n-1),
+# and the hotspot classes come from them, not from the normal approximation.
+
+SPATIAL_DIR = Path(disk_cache.CACHE_DIR or ".cache") / "spatial"
+COORD_DECIMALS = 6
+N_PERMUTATIONS = 999
+
+# Gi* pseudo p-value thresholds (99/95/90%); the sign of z picks hot or cold
+GI_CLASSES = [(0.01, "Hotspot 99%"), (0.05, "Hotspot 95%"), (0.10, "Hotspot 90%")]
+
+
+def _rings(geom: dict):
+    if geom.get("type") == "Polygon":
+        yield from geom["coordinates"]
+    elif geom.get("type") == "MultiPolygon":
+        for poly in geom["coordinates"]:
+            yield from poly
+
+
+def build_contiguity(gj: dict):
+    """CSR (indptr, indices) da contiguidade queen entre as features."""
+    owners = defaultdict(set)
+    for i, feat in enumerate(gj["features"]):
+        for ring in _rings(feat.get("geometry") or {}):
+            for x, y, *_ in ring:
+                owners[(round(x, COORD_DECIMALS), round(y, COORD_DECIMALS))].add(i)
+
+    n = len(gj["features"])
+    vizinhos = [set() for _ in range(n)]
+    for donos in owners.values():
+        if len(donos) > 1:
+            for i in donos:
+                vizinhos[i].update(donos)
+    for i in range(n):
+        vizinhos[i].discard(i)
+
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(v) for v in vizinhos])
+    indices = np.fromiter((j for v in vizinhos for j in sorted(v)), dtype=np.int64, count=int(indptr[-1]))
+    return indptr, indices
+
+
+@lru_cache(maxsize=4)
+def _load_weights(path: str, version: str):
+    SPATIAL_DIR.mkdir(parents=True, exist_ok=True)
+    arquivo = SPATIAL_DIR / f"{Path(path).stem}-{version}.npz"
+    if arquivo.exists():
+        with np.load(arquivo) as npz:
+            return npz["indptr"], npz["indices"]
+    with open(path, "r", encoding="utf-8") as f:
+        indptr, indices = build_contiguity(json.load(f))
+    tmp = arquivo.with_name(f"{arquivo.stem}.{os.getpid()}.tmp.npz")
+    np.savez(tmp, indptr=indptr, indices=indices)
+    tmp.replace(arquivo)
+    return indptr, indices
+
+
+def contiguity_weights(geojson_path: str):
+    """Matriz de vizinhança do GeoJSON, calculada uma vez por versão do arquivo."""
+    return _load_weights(str(geojson_path), dataset_version(geojson_path))
+
+
+def spatial_lag(indptr, indices, x, standardize: bool = True):
+    """W·x para x com shape (n,) ou (n, P), W binária ou padronizada por linha."""
+    x = np.asarray(x, dtype=float)
+    acumulado = np.concatenate([np.zeros((1,) + x.shape[1:]), np.cumsum(x[indices], axis=0)])
+    soma = acumulado[indptr[1:]] - acumulado[indptr[:-1]]
+    if not standardize:
+        return soma
+    grau = np.diff(indptr).astype(float)
+    grau = grau.reshape((-1,) + (1,) * (x.ndim - 1))
+    return np.divide(soma, grau, out=np.zeros_like(soma), where=grau > 0)
+
+
+def _pseudo_p(observado, simulados):
+    # folded pseudo p-value (as in PySAL): extreme in either tail
+    maiores = (simulados >= observado[..., None]).sum(axis=-1)
+    p = simulados.shape[-1]
+    extremos = np.minimum(maiores, p - maiores)
+    return (extremos + 1) / (p + 1)
+
+
+def _permutations(z, n_perm: int, rng):
+    return rng.permuted(np.tile(z, (n_perm, 1)), axis=1).T  # (n, P)
+
+
+def _conditional_sums(indptr, x, n_perm: int, rng):
+    """Soma dos vizinhos de cada bairro com x_i fixo e os vizinhos sorteados entre os outros n-1: (n, P).
+
+    Same scheme as PySAL's conditional randomization: one draw of k_max
+    positions out of n-1 per permutation, shared by every bairro, shifted
+    past i so that x_i itself is never drawn.
+    """
+    n = x.size
+    grau = np.diff(indptr)
+    somas = np.zeros((n, n_perm))
+    k_max = int(grau.max()) if n else 0
+    if k_max == 0 or n < 2:
+        return somas
+    sorteio = np.stack([rng.permutation(n - 1)[:k_max] for _ in range(n_perm)])  # (P, k_max)
+    for k in np.unique(grau[grau > 0]):
+        linhas = np.flatnonzero(grau == k)
+        pos = sorteio[None, :, :k] + (sorteio[None, :, :k] >= linhas[:, None, None])  # (m, P, k)
+        somas[linhas] = x[pos].sum(axis=2)
+    return somas
+
+
+def morans_i(indptr, indices, x, n_perm: int = N_PERMUTATIONS, seed: int = 0) -> dict:
+    """I de Moran global com p-valor por permutação."""
+    x = np.asarray(x, dtype=float)
+    n = x.size
+    z = x - x.mean()
+    if not (z ** 2).sum():
+        return {"I": np.nan, "p": np.nan}
+    s0 = float((np.diff(indptr) > 0).sum())  # row-standardized: one per non-island row
+
+    global_i = n / s0 * (z @ spatial_lag(indptr, indices, z)) / (z @ z)
+    zp = _permutations(z, n_perm, np.random.default_rng(seed))
+    global_sim = n / s0 * (zp * spatial_lag(indptr, indices, zp)).sum(axis=0) / (z @ z)
+    return {"I": float(global_i), "p": float(_pseudo_p(np.asarray(global_i), global_sim))}
+
+
+def getis_ord_gi_star(indptr, indices, x, n_perm: int = N_PERMUTATIONS, seed: int = 0) -> dict:
+    """{"z": z-scores Gi*, "p": pseudo p-valores por permutação condicional} (pesos binários com o próprio bairro)."""
+    x = np.asarray(x, dtype=float)
+    n = x.size
+    media = x.mean()
+    s = np.sqrt((x ** 2).mean() - media ** 2)
+    if s == 0 or n < 2:
+        return {"z": np.zeros(n), "p": np.ones(n)}
+    soma_w = np.diff(indptr) + 1.0  # binary weights + self, so sum(w) == sum(w²)
+    denom = s * np.sqrt((n * soma_w - soma_w ** 2) / (n - 1))
+    gi = (spatial_lag(indptr, indices, x, standardize=False) + x - media * soma_w) / denom
+    # x_i stays in its own sum, only the neighbours are redrawn
+    somas = _conditional_sums(indptr, x, n_perm, np.random.default_rng(seed))
+    gi_sim = (somas + (x - media * soma_w)[:, None]) / denom[:, None]
+    return {"z": gi, "p": _pseudo_p(gi, gi_sim)}
+
+
+def classify_gi(z, p) -> list:
+    classes = []
+    for v, pv in zip(np.asarray(z), np.asarray(p)):
+        rotulo = "Não significativo"
+        for limite, nome in GI_CLASSES:
+            if pv <= limite:
+                rotulo = nome if v > 0 else nome.replace("Hotspot", "Coldspot")
+                break
+        classes.append(rotulo)
+    return classes
+
+
+def feature_totals(gj: dict, name_prop: str, totais: dict) -> np.ndarray:
+    """Total por feature; bairros com várias features dividem o total entre elas.
+
+    Os nomes dos dois lados passam por `normalizar`, como no ETL.
+    """
+    por_nome = defaultdict(float)
+    for nome, v in totais.items():
+        por_nome[normalizar(nome)] += v
+    nomes = [normalizar(feat["properties"].get(name_prop) or "") for feat in gj["features"]]
+    contagem = defaultdict(int)
+    for nome in nomes:
+        contagem[nome] += 1
+    return np.array([por_nome.get(nome, 0) / contagem[nome] for nome in nomes], dtype=float)
@@ -0,0 +1,133 @@
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+# Startup profile: import cost of the entry point, the pages and the charts.
+#
+#   python -m src.startup_profile --repeticoes 5 --top 10
+#
+# Modules are imported in the order a session meets them (login screen,
+# page, one chart after the other) in a fresh interpreter under
+# `python -X importtime`, so each line is the extra cost of that step given
+# what was already loaded. Each step is checked against BUDGET_MS (the best
+# of --repeticoes runs, to drop disk/cache noise) and the login step must not
+# load any module in LOGIN_FORBIDDEN. Exits with status 1 on any violation.
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# ms per step, incremental over the steps before it
+BUDGET_MS = {
+    "app": 900,
+    "src.views.dashboard": 900,
+    "src.views.comparacao": 150,
+    "src.charts.heatmap": 150,
+    "src.charts.barras": 300,
+    "src.charts.pizza": 50,
+    "src.charts.histograma": 50,
+    "src.charts.associacao": 50,
+    "src.charts.mapa": 50,
+    "src.charts.waffle": 50,
+    "src.charts.comparacao": 50,
+    "src.charts.payload": 50,
+    "src.charts.sobrevivencia": 50,
+}
+# the login screen only needs streamlit
+LOGIN_FORBIDDEN = ["pandas", "numpy", "pyarrow", "plotly.express", "plotly.graph_objs"]
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def import_times(modulos) -> list:
+    """[(etapa, módulo, self_us, cumulativo_us)] de uma execução com -X importtime."""
+    codigo = "; ".join(f"import {m}" for m in modulos)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=ROOT,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"falha ao importar {modulos}:\n{proc.stderr[-2000:]}")
+
+    linhas, pendentes = [], []
+    for linha in proc.stderr.splitlines():
+        m = _LINE.match(linha)
+        if not m:
+            continue
+        self_us, cum_us, recuo, nome = int(m[1]), int(m[2]), m[3], m[4]
+        pendentes.append((nome, self_us, cum_us))
+        if recuo:
+            continue
+        # importtime prints children before their parent, so a top-level line
+        # closes a step; interpreter startup (site, encodings) is dropped
+        if nome in modulos:
+            linhas.extend((nome, n, s, c) for n, s, c in pendentes)
+        pendentes = []
+    # a module already loaded by an earlier step prints nothing: it costs 0
+    vistos = {etapa for etapa, *_ in linhas}
+    linhas.extend((m, m, 0, 0) for m in modulos if m not in vistos)
+    return linhas
+
+
+def profile(modulos, repeticoes: int) -> dict:
+    """{etapa: {"ms": melhor total, "modulos": {nome: self_ms}}}, melhor de `repeticoes`."""
+    resultado = {}
+    for _ in range(repeticoes):
+        etapas = {}
+        for etapa, nome, self_us, cum_us in import_times(modulos):
+            e = etapas.setdefault(etapa, {"ms": 0.0, "modulos": {}})
+            e["modulos"][nome] = self_us / 1000
+            if nome == etapa:
+                e["ms"] = cum_us / 1000
+        for etapa, e in etapas.items():
+            if etapa not in resultado or e["ms"] < resultado[etapa]["ms"]:
+                resultado[etapa] = e
+    return resultado
+
+
+def check(resultado: dict, budget: dict) -> list:
+    falhas = []
+    for etapa, e in resultado.items():
+        if e["ms"] > budget[etapa]:
+            falhas.append(f"{etapa}: {e['ms']:.0f} ms > orçamento de {budget[etapa]} ms")
+    carregados = resultado.get("app", {}).get("modulos", {})
+    for nome in LOGIN_FORBIDDEN:
+        if nome in carregados:
+            falhas.append(f"app: a tela de login importa {nome}")
+    return falhas
+
+
+def _budget_arg(valor: str):
+    modulo, _, ms = valor.partition("=")
+    try:
+        return modulo, int(ms)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"use modulo=ms, recebido {valor!r}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tempo de import por etapa da inicialização, com orçamento")
+    parser.add_argument("--repeticoes", type=int, default=3, help="execuções; vale a melhor de cada etapa")
+    parser.add_argument("--top", type=int, default=5, help="módulos mais lentos listados por etapa")
+    parser.add_argument("--budget", type=_budget_arg, action="append", default=[], metavar="MODULO=MS",
+                        help="substitui o orçamento de uma etapa (pode repetir)")
+    args = parser.parse_args(argv)
+
+    budget = {**BUDGET_MS, **dict(args.budget)}
+    resultado = profile(list(budget), args.repeticoes)
+
+    print(f"{'etapa':<24}{'ms':>9}{'orçamento':>11}")
+    for etapa, e in resultado.items():
+        print(f"{etapa:<24}{e['ms']:>9.1f}{budget[etapa]:>11}")
+        lentos = sorted(e["modulos"].items(), key=lambda kv: kv[1], reverse=True)[:args.top]
+        for nome, ms in lentos:
+            print(f"    {nome:<40}{ms:>9.1f}")
+
+    falhas = check(resultado, budget)
+    for falha in falhas:
+        print(f"✘ {falha}", file=sys.stderr)
+    if falhas:
+        sys.exit(1)
+    print("✔ inicialização dentro do orçamento")
+
+
+if __name__ == "__main__":
+    main()
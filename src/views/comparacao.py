@@ -0,0 +1,59 @@
+import pandas as pd
+import streamlit as st
+
+from src.aggregations import dataset_version
+from src.comparacao import aligned
+from src.config import CIDADES
+from src.views.dados import load_comparison
+
+
+def render(profile):
+    st.header("Comparação — Belo Horizonte × Porto Alegre")
+    cidades = {c["nome"]: c["db"] for c in CIDADES.values()}
+    try:
+        perfis = load_comparison(tuple(cidades.items()), tuple(dataset_version(db) for db in cidades.values()))
+    except Exception as e:
+        st.error(f"Erro ao carregar as cidades para comparação: {e}")
+        st.stop()
+
+    anos = sorted(set().union(*(p["anos"] for p in perfis.values())))
+    comuns = set.intersection(*(set(p["anos"]) for p in perfis.values()))
+    st.sidebar.header("Filtros")
+    anos_sel = st.sidebar.multiselect("Anos", anos, default=[max(comuns or anos)])
+    if not anos_sel:
+        st.warning("Selecione pelo menos um ano.")
+        st.stop()
+    relativo = st.sidebar.radio("Escala", ["% do total da cidade", "Casos"]) != "Casos"
+    rotulo = "% da cidade" if relativo else "Casos"
+
+    for col, (nome, perfil) in zip(st.columns(len(perfis)), perfis.items()):
+        por_ano = perfil["por_ano"]
+        col.metric(f"Casos — {nome}", f"{int(por_ano.loc[por_ano['ANOFATO'].isin(anos_sel), 'Quantidade'].sum()):,}")
+
+    # cached figure payloads (src/charts/payload.py), keyed by both DB versions
+    from src.charts import payload
+    versao = "|".join(dataset_version(db) for db in cidades.values())
+    chave = {"anos": sorted(int(a) for a in anos_sel), "relativo": relativo, "layout": profile["layout"]}
+
+    paineis = [("Tipos de Violência", "TIPOVIOLENCIA"), ("Cor da Pele", "COR_PELE"), ("Faixa de Idade", "IDADE")]
+    vertical = profile["layout"] == "Vertical"
+    for titulo, dimensao in paineis:
+        st.subheader(titulo)
+
+        def painel(titulo=titulo, dimensao=dimensao):
+            df = aligned(perfis, dimensao, anos_sel, relativo)
+            if df.empty:
+                return "Nenhum dado para os anos selecionados."
+            from src.charts import comparacao as grafico
+            return grafico.figure(df, titulo, rotulo, 380 if vertical else 450)
+
+        payload.show(f"comparacao_{dimensao}", versao, chave, painel)
+
+    st.subheader("Casos por Ano")
+
+    def por_ano_panel():
+        por_ano = pd.concat([p["por_ano"].assign(cidade=nome) for nome, p in perfis.items()], ignore_index=True)
+        from src.charts import comparacao as grafico
+        return grafico.figure_anos(por_ano)
+
+    payload.show("comparacao_anos", versao, {}, por_ano_panel)
@@ -0,0 +1,84 @@
+import json
+from pathlib import Path
+
+import streamlit as st
+
+from src import disk_cache
+from src.aggregations import load_city_tables, read_catalog, catalog_options, dataset_version, category_filters
+from src.associacao import encode_dimensions, association_matrix
+from src.bitmaps import BitmapIndex
+from src.comparacao import compare_cities
+from src.geo import simplify_geojson
+from src.normalizacao import normalizar
+from src.sobrevivencia import read_inquiries, survival_curves
+
+# Cached loaders shared by the pages (src/views/). Only imported after login.
+
+
+@st.cache_data(ttl=600, max_entries=2)
+def load_city(db_path: str):
+    return load_city_tables(db_path)
+
+@st.cache_data(ttl=600, max_entries=4)
+def load_catalog(db_path: str, versao: str):
+    return catalog_options(read_catalog(db_path))
+
+@st.cache_resource(max_entries=2)
+def load_bitmaps(db_path: str, versao: str):
+    # built from the same cached tables, so row positions match cat_full
+    return BitmapIndex(load_city(db_path)[0])
+
+@st.cache_resource(max_entries=2)
+def load_dimension_codes(db_path: str, versao: str):
+    return encode_dimensions(load_city(db_path)[0])
+
+@st.cache_data(ttl=600, max_entries=64)
+def load_association(db_path: str, versao: str, anos, tipos, cores, bairros):
+    # cached per dataset version and filter state; a miss is bitmap + bincount work only
+    index = load_bitmaps(db_path, versao)
+    linhas = index.rows(index.match(category_filters(anos, tipos, cores, bairros)))
+    return association_matrix(load_dimension_codes(db_path, versao), linhas)
+
+@st.cache_data(ttl=600)
+def load_geojson(path: str, shape_col_name: str = None):
+    if not Path(path).exists():
+        raise FileNotFoundError(f"GeoJSON não encontrado: {path}")
+    return disk_cache.cached("geojson", dataset_version(path), {"path": str(Path(path).resolve()), "col": shape_col_name},
+                             lambda: read_geojson(path, shape_col_name))
+
+@st.cache_data(ttl=600)
+def load_map_geojson(path: str, shape_col_name: str, step: int, decimals):
+    # keyed by the render profile's geometry settings, one payload per profile
+    return simplify_geojson(load_geojson(path, shape_col_name), step=step, decimals=decimals)
+
+def read_geojson(path: str, shape_col_name: str = None):
+    if not Path(path).exists():
+        raise FileNotFoundError(f"GeoJSON não encontrado: {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        gj = json.load(f)
+    if gj.get("type") != "FeatureCollection":
+        raise ValueError("GeoJSON deve ser FeatureCollection")
+    # normalize requested shape column (se informado, como o ETL normaliza BAIRRO) and always create id_bairro index
+    for i, feat in enumerate(gj["features"]):
+        if shape_col_name:
+            val = feat["properties"].get(shape_col_name, "")
+            feat["properties"][shape_col_name] = normalizar(val)
+        # create id_bairro if missing
+        if "id_bairro" not in feat["properties"]:
+            feat["properties"]["id_bairro"] = i
+    return gj
+
+@st.cache_resource(max_entries=2)
+def load_inquiries(db_path: str, versao: str):
+    # None for cities without the inquiry extract
+    return read_inquiries(db_path)
+
+@st.cache_data(ttl=600, max_entries=64)
+def load_survival(db_path: str, versao: str, por: str, tipos, anos, min_casos: int):
+    # per dataset version and filter key; a miss is one vectorized pass over the selected inquiries
+    return survival_curves(load_inquiries(db_path, versao), por, {"DESC_FATO": tipos, "ANOINSTAURACAO": anos}, min_casos)
+
+@st.cache_data(ttl=600, max_entries=4)
+def load_comparison(dbs: tuple, versoes: tuple):
+    # versoes only keys the cache: a rewritten DB gets a new entry
+    return compare_cities(dict(dbs))
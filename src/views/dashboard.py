@@ -0,0 +1,417 @@
+import numpy as np
+import streamlit as st
+from src.export import LINK_VALIDITY_S, build_query, download_url, export_query, parquet_available
+from src.config import API_URL, CIDADES, cidade_por_nome
+from src.spatial import (
+    N_PERMUTATIONS, contiguity_weights, morans_i, getis_ord_gi_star, classify_gi, feature_totals,
+)
+from src import disk_cache
+from src.aggregations import (
+    HEAT_AXES, dataset_version, category_filters, category_totals, bairro_totals,
+    heatmap_slice, heatmap_from_categorias, heatmap_matrix, filter_hist, age_bins,
+)
+from src.sobrevivencia import ESTRATOS
+from src.views.dados import (
+    load_city, load_catalog, load_bitmaps, load_association, load_map_geojson, load_inquiries, load_survival,
+)
+
+# City dashboard. Each panel imports its chart module (src/charts/) only
+# when it renders, so plotly is loaded on the first chart, not with the page.
+
+def selected_points(key: str) -> list:
+    estado = st.session_state.get(key)
+    return list(estado["selection"]["points"]) if estado else []
+
+
+def export_sidebar(db_path: str, data_source: str, targets: dict):
+    st.sidebar.markdown("### Exportação")
+    alvo = st.sidebar.selectbox("Dados para exportar", list(targets))
+    formatos = ["csv", "parquet"] if parquet_available() else ["csv"]
+    fmt = st.sidebar.radio("Formato", formatos, horizontal=True)
+    sql, params = targets[alvo]
+
+    # the file is only built on demand and is downloaded from the API, which
+    # streams it from disk: its bytes never go through the Streamlit worker
+    if not st.sidebar.button("Gerar arquivo"):
+        return
+    try:
+        path = export_query(db_path, sql, params, fmt=fmt)
+    except Exception as e:
+        st.sidebar.error(f"Erro ao gerar exportação: {e}")
+        return
+    nome = f"sobrevida_{data_source}_{alvo}".lower()
+    nome = "".join(ch if ch.isalnum() else "_" for ch in nome) + f".{fmt}"
+    st.sidebar.link_button("Baixar arquivo", download_url(API_URL, path, nome))
+    st.sidebar.caption(f"Link válido por {LINK_VALIDITY_S // 60} minutos (requer a API: `python -m src.api`).")
+
+
+def render(profile):
+    data_source = st.sidebar.radio("Fonte dos dados", [c["nome"] for c in CIDADES.values()])
+
+    cidade = cidade_por_nome(data_source)
+    DB_PATH = cidade["db"]
+    SHAPE_PATH = cidade["geo"]
+    SHAPE_COL = cidade["shape_col"]
+
+    try:
+        # the sidebar comes from the small catalog table (src/schema.py), not from the fact tables
+        versao = dataset_version(DB_PATH)
+        opcoes = load_catalog(DB_PATH, versao)
+    except Exception as e:
+        st.error(f"Erro ao carregar o catálogo do DB ({DB_PATH}): {e}")
+        st.stop()
+
+    anos = opcoes["anos"]
+    if not anos:
+        st.error("Nenhum ano encontrado na tabela categorias.")
+        st.stop()
+
+    # DEFAULTS: último ano
+    ultimo_ano = int(max(anos))
+    st.sidebar.header("Filtros")
+
+    # ano (multi-select)
+    anos_selecionados = st.sidebar.multiselect("Anos", anos, default=[ultimo_ano])
+    if not anos_selecionados:
+        st.warning("Selecione pelo menos um ano.")
+        st.stop()
+
+    bairros_all = opcoes["BAIRRO"]["valores"]
+    top5_bairros = opcoes["BAIRRO"]["top"]
+
+    # Layout option (preserva seu comportamento)
+    layout_option = st.sidebar.radio("Escolha o layout", ["Horizontal", "Vertical"],
+                                     index=1 if profile["layout"] == "Vertical" else 0)
+
+    # bairros selector
+    bairros_sel = st.sidebar.multiselect("Bairros", bairros_all, default=top5_bairros)
+
+
+    # cores de pele
+    cores_all = opcoes["COR_PELE"]["valores"]
+    top5_cores = opcoes["COR_PELE"]["top"]
+    cores_sel = st.sidebar.multiselect("Cor da Pele", cores_all, default=top5_cores)
+
+    # Tipos de violência
+    tipos_all = opcoes["TIPOVIOLENCIA"]["valores"]
+    tipos_sel = st.sidebar.multiselect("Tipo de Violência", tipos_all, default=tipos_all)
+
+
+    st.sidebar.markdown("### Heatmap — Configuração")
+    eixo_x = st.sidebar.selectbox("Eixo X", HEAT_AXES, index=0)
+    eixo_y = st.sidebar.selectbox("Eixo Y", HEAT_AXES, index=1)
+
+    # Bar chart grouping control
+    st.sidebar.markdown("### Gráfico de Barras — Configuração")
+    bar_group = st.sidebar.selectbox("Agrupar por", ["BAIRRO", "TIPOVIOLENCIA", "COR_PELE"], index=0)
+
+    try:
+        # tables in the schema contract (src/schema.py), shared across workers when disk_cache is on
+        cat_full, heat_full, hist_full = load_city(DB_PATH)
+    except Exception as e:
+        st.error(f"Erro ao carregar tabelas do DB ({DB_PATH}): {e}")
+        st.stop()
+
+    try:
+        geojson_map = load_map_geojson(SHAPE_PATH, SHAPE_COL, profile["geo_step"], profile["geo_decimals"])
+    except Exception as e:
+        st.error(f"Erro ao carregar GeoJSON ({SHAPE_PATH}): {e}")
+        st.stop()
+
+    index = load_bitmaps(DB_PATH, versao)
+    base_bits = index.match(category_filters(anos_selecionados, tipos_sel, cores_sel, bairros_sel))
+    cat_df = index.take(cat_full, base_bits)
+
+    # cross-filtering: a click on the heatmap, bar or skin-colour panel filters
+    # the other two; each panel's rows are the sidebar bitset ANDed with the
+    # others' selections. A chart's widget id hashes its spec, which changes
+    # whenever another panel's selection does, so the widget state is lost on
+    # that rerun: each chart's on_select callback copies its selection into
+    # session_state, tagged with what the chart showed, and that copy is read.
+    st.session_state.setdefault("selecao_rodada", 0)
+    selecoes = st.session_state.setdefault("selecoes_graficos", {})
+    if st.sidebar.button("Limpar seleção dos gráficos"):
+        # new widget keys start with an empty selection
+        st.session_state["selecao_rodada"] += 1
+        selecoes.clear()
+    rodada = st.session_state["selecao_rodada"]
+    chaves = {"heatmap": f"sel_heatmap_{DB_PATH}_{eixo_x}_{eixo_y}_{rodada}",
+              "barras": f"sel_barras_{DB_PATH}_{bar_group}_{rodada}",
+              "cores": f"sel_cores_{DB_PATH}_{rodada}"}
+    contextos = {"heatmap": [DB_PATH, eixo_x, eixo_y], "barras": [DB_PATH, bar_group], "cores": [DB_PATH]}
+
+    def guardar_selecao(painel):
+        key, contexto = chaves[painel], contextos[painel]
+
+        def on_select():
+            selecoes[painel] = {"contexto": contexto, "pontos": selected_points(key)}
+        return on_select
+
+    def pontos(painel):
+        sel = selecoes.get(painel)
+        return sel["pontos"] if sel and sel["contexto"] == contextos[painel] else []
+
+    # each selection is a list of alternatives (OR), each one a filter dict (AND):
+    # a heatmap selection is the union of its cells, not every x × every y
+    sel_barras = sorted({p["x"] for p in pontos("barras")})
+    sel_cores = sorted({p["y"] for p in pontos("cores")})
+    sel_heat = pontos("heatmap")
+    cruz_barras = [{bar_group: sel_barras}] if sel_barras else []
+    cruz_cores = [{"COR_PELE": sel_cores}] if sel_cores else []
+    cruz_heat = []
+    if sel_heat and eixo_x != eixo_y:
+        celulas = sorted({(p["x"], p["y"]) for p in sel_heat})
+        cruz_heat = [{eixo_x: [x], eixo_y: [y]} for x, y in celulas]
+        st.sidebar.caption(f"Seleção em Heatmap — {eixo_x} × {eixo_y}: "
+                           + ", ".join(f"{x} × {y}" for x, y in celulas))
+    if sel_barras:
+        st.sidebar.caption(f"Seleção em Barras — {bar_group}: {', '.join(map(str, sel_barras))}")
+    if sel_cores:
+        st.sidebar.caption(f"Seleção em Cor da Pele: {', '.join(map(str, sel_cores))}")
+
+    def panel_rows(*cruzados):
+        bits = base_bits
+        for alternativas in cruzados:
+            if alternativas:
+                bits = bits & index.match_any(alternativas)
+        return index.take(cat_full, bits)
+
+    # canonical filter state: panel aggregates are shared across workers under this key
+    filtros_key = {"db": DB_PATH, "perfil": profile["nome"], "anos": sorted(int(a) for a in anos_selecionados),
+                   "tipos": sorted(tipos_sel), "cores": sorted(cores_sel), "bairros": sorted(bairros_sel)}
+
+    def shared(namespace, extra, compute):
+        return disk_cache.cached(namespace, versao, {**filtros_key, **extra}, compute)
+
+    # exportação: cada alvo vira uma consulta SQL lida em blocos direto do DB
+    cat_filters = {"ANOFATO": anos_selecionados, "TIPOVIOLENCIA": tipos_sel,
+                   "COR_PELE": cores_sel, "BAIRRO": bairros_sel}
+    heat_filters = {"ANOFATO": anos_selecionados, "EixoX": [eixo_x], "EixoY": [eixo_y]}
+    if bairros_sel and eixo_x == "BAIRRO":
+        heat_filters["X_val"] = bairros_sel
+    if bairros_sel and eixo_y == "BAIRRO":
+        heat_filters["Y_val"] = bairros_sel
+    export_targets = {
+        "Registros filtrados": build_query("categorias", cat_filters),
+        "Barras — agregado": build_query("categorias", cat_filters, group_by=[bar_group], sum_col="Quantidade"),
+        "Cor da Pele — agregado": build_query("categorias", cat_filters, group_by=["COR_PELE"], sum_col="Quantidade"),
+        "Heatmap — agregado": build_query("heatmap", heat_filters, group_by=["Y_val", "X_val"], sum_col="Quantidade"),
+        "Idade — agregado": build_query("histograma", {"ANOFATO": anos_selecionados}, group_by=["IDADE"]),
+    }
+    export_sidebar(DB_PATH, data_source, export_targets)
+
+    def get_columns(container, n=2):
+        if layout_option == "Vertical":
+            # return list of same container so with-statement will stack
+            return [container] * n
+        return container.columns(n)
+
+    # figures go out as cached JSON payloads (src/charts/payload.py): a repeated
+    # view with the same data version, filters and layout skips aggregation and plotly
+    def figura(painel, extra, build, base=None, **kwargs):
+        from src.charts import payload
+        if base is None:
+            base = {**filtros_key, "layout": layout_option}
+        payload.show(painel, versao, {**base, **extra}, build, **kwargs)
+
+    container1 = st.container()
+    col1, col2 = get_columns(container1, 2)
+
+    with col1:
+        st.subheader("Heatmap")
+        top_n = profile["heat_top_n"]
+
+        def heat_panel():
+            if cruz_barras or cruz_cores:
+                df_h = heatmap_from_categorias(panel_rows(cruz_barras, cruz_cores), eixo_x, eixo_y)
+            else:
+                df_h = heatmap_slice(heat_full, anos_selecionados, eixo_x, eixo_y, bairros_sel)
+            if df_h.empty:
+                return "Nenhum dado disponível para este Heatmap."
+            # compute top-N for each axis (only among the rows present in df_h)
+            matriz = heatmap_matrix(df_h, top_n=top_n)
+            if matriz is None:
+                return f"Não há dados suficientes para compor um Heatmap com os Top {top_n}."
+            from src.charts import heatmap
+            return heatmap.figure(matriz, f"{eixo_x} × {eixo_y} — Top {top_n} por eixo")
+
+        figura("heatmap", {"x": eixo_x, "y": eixo_y, "cruzado": [cruz_barras, cruz_cores]}, heat_panel,
+               key=chaves["heatmap"], on_select=guardar_selecao("heatmap"))
+
+    with col2:
+        st.subheader("Casos por Categoria Selecionada")
+
+        def bar_panel():
+            bar_df = category_totals(panel_rows(cruz_heat, cruz_cores), bar_group)
+            if bar_df.empty:
+                return "Nenhum dado para o gráfico de barras."
+            from src.charts import barras
+            return barras.figure(bar_df, bar_group)
+
+        figura("barras", {"grupo": bar_group, "cruzado": [cruz_heat, cruz_cores]}, bar_panel,
+               key=chaves["barras"], on_select=guardar_selecao("barras"))
+
+    container2 = st.container()
+    col3, col4 = get_columns(container2, 2)
+
+    with col3:
+        st.subheader("Distribuição por Cor da Pele")
+
+        def pie_panel():
+            pie_df = category_totals(panel_rows(cruz_barras, cruz_heat), "COR_PELE")
+            if pie_df.empty:
+                return "Nenhum dado para a seleção atual."
+            from src.charts import pizza
+            return pizza.figure(pie_df, "COR_PELE")
+
+        figura("cor_pele", {"cruzado": [cruz_barras, cruz_heat]}, pie_panel,
+               key=chaves["cores"], on_select=guardar_selecao("cores"))
+
+    with col4:
+        st.subheader("Histograma de Idade")
+        nbins = profile["hist_bins"]
+
+        def hist_panel():
+            from src.charts import histograma
+            if profile["pre_binned"]:
+                # only the bin counts go to the browser, not one value per record
+                hist_df = age_bins(filter_hist(hist_full, anos_selecionados), nbins)
+                fig = histograma.figure_bins(hist_df)
+            else:
+                hist_df = filter_hist(hist_full, anos_selecionados)[["IDADE"]]
+                fig = histograma.figure(hist_df, nbins)
+            return "Nenhum registro no histograma para os filtros selecionados." if hist_df.empty else fig
+
+        figura("idades", {"bins": nbins, "pre_binned": profile["pre_binned"]}, hist_panel)
+
+    st.subheader("Associação entre Dimensões")
+
+    def assoc_panel():
+        assoc = load_association(DB_PATH, versao, sorted(anos_selecionados), sorted(tipos_sel), sorted(cores_sel), sorted(bairros_sel))
+        if assoc.shape[0] < 2:
+            return "Dimensões insuficientes com mais de um valor para os filtros selecionados."
+        from src.charts import associacao
+        return associacao.figure(assoc), ("V de Cramér (0 = independentes, 1 = associação total) entre cada par de dimensões, "
+                                          "ponderado pela quantidade de casos dos filtros atuais.")
+
+    figura("associacao", {}, assoc_panel)
+
+    st.header("Mapa coroplético — Casos por Bairro")
+
+    if not geojson_map["features"]:
+        st.info("GeoJSON não contém features.")
+    else:
+        camada = st.radio("Camada do mapa", ["Casos", "Hotspots (Gi*)"], horizontal=True)
+
+        def map_panel():
+            cat_for_map = cat_full[cat_full["ANOFATO"].isin(anos_selecionados)]
+            total_real = int(cat_for_map["Quantidade"].sum())
+            n_features = len(geojson_map["features"])
+            if total_real <= 0:
+                valores = np.random.randint(1, 10, size=n_features)
+            else:
+                valores = np.random.rand(n_features)
+                valores = valores / valores.sum() * total_real
+                valores = np.round(valores).astype(int)
+                diff = int(total_real - valores.sum())
+                if diff != 0:
+                    idx = np.random.randint(0, n_features)
+                    valores[idx] += diff
+                valores = [max(int(v), 1) for v in valores]
+
+            # write into geojson
+            for feat, v in zip(geojson_map["features"], valores):
+                feat["properties"]["TotalCasos"] = int(v)
+                if "ID" not in feat["properties"] and "id" not in feat["properties"]:
+                    feat["properties"].setdefault("id_bairro", feat["properties"].get("id_bairro", 0))
+
+            sample_props = geojson_map["features"][0]["properties"]
+            if "ID" in sample_props:
+                featureidkey = "properties.ID"
+                locations = [f["properties"]["ID"] for f in geojson_map["features"]]
+            elif "id" in sample_props:
+                featureidkey = "properties.id"
+                locations = [f["properties"]["id"] for f in geojson_map["features"]]
+            else:
+                featureidkey = "properties.id_bairro"
+                locations = [f["properties"]["id_bairro"] for f in geojson_map["features"]]
+
+            casos = [f["properties"]["TotalCasos"] for f in geojson_map["features"]]
+
+            from src.charts import mapa
+            if camada == "Casos":
+                return mapa.casos(geojson_map, locations, featureidkey, casos, cidade, profile["map_height"])
+            if not SHAPE_COL:
+                return "O GeoJSON desta cidade não tem o nome do bairro; não é possível calcular hotspots."
+            # real per-bairro totals; the bairro filter is ignored here, it would cut out the neighbours
+            totais = shared("bairros_totais", {}, lambda: bairro_totals(
+                index.take(cat_full, index.match(category_filters(anos_selecionados, tipos_sel, cores_sel)))
+            ).set_index("BAIRRO")["Quantidade"].to_dict())
+            x = feature_totals(geojson_map, SHAPE_COL, totais)
+            indptr, indices = contiguity_weights(SHAPE_PATH)
+            gi = getis_ord_gi_star(indptr, indices, x)
+            moran = morans_i(indptr, indices, x)
+            lim = max(3.0, float(np.abs(gi["z"]).max()))
+            fig_map = mapa.hotspots(geojson_map, locations, featureidkey, gi["z"], lim,
+                                    [f["properties"].get(SHAPE_COL) for f in geojson_map["features"]],
+                                    {"Casos": np.round(x).astype(int), "p (permutação)": np.round(gi["p"], 3),
+                                     "Classe": classify_gi(gi["z"], gi["p"])},
+                                    cidade, profile["map_height"])
+            return fig_map, (f"I de Moran global = {moran['I']:.3f} (p = {moran['p']:.3f}, {N_PERMUTATIONS} permutações); "
+                             "vizinhança por contiguidade entre bairros. Classes de hotspot/coldspot pelo p-valor de "
+                             f"{N_PERMUTATIONS} permutações condicionais do Gi* (vizinhos sorteados, bairro fixo).")
+
+        # the map payload is the largest (MBs with the full geometry): key it only on
+        # what it reads, so bairro changes and layout switches reuse it
+        mapa_key = {"db": DB_PATH, "perfil": profile["nome"], "anos": filtros_key["anos"], "camada": camada}
+        if camada != "Casos":
+            mapa_key.update(tipos=filtros_key["tipos"], cores=filtros_key["cores"])
+        figura("mapa", {}, map_panel, base=mapa_key)
+
+    st.subheader("Prevalência dos Tipos de Violência")
+    if "TIPOVIOLENCIA" in cat_df.columns:
+        def waffle_panel():
+            prev = cat_df["TIPOVIOLENCIA"].value_counts().reset_index()
+            prev.columns = ["TipoViolencia", "Total"]
+            if prev.empty:
+                return "Nenhum dado disponível para os filtros selecionados."
+            from src.charts import waffle
+            prev["Perc"] = waffle.cells(prev["Total"].to_numpy())
+            return waffle.figure(prev)
+
+        figura("waffle", {}, waffle_panel)
+    else:
+        st.info("TIPOVIOLENCIA não disponível para geração do waffle.")
+
+    inqueritos = load_inquiries(DB_PATH, versao)
+    if inqueritos is not None:
+        st.subheader("Tempo até a Remessa do Inquérito")
+        col5, col6 = st.columns(2)
+        rotulo = col5.selectbox("Estratificar por", list(ESTRATOS))
+        anos_inq = sorted(int(a) for a in inqueritos["ANOINSTAURACAO"].cat.categories)
+        if len(anos_inq) > 1:
+            ini, fim = col6.select_slider("Anos de instauração", anos_inq, value=(anos_inq[0], anos_inq[-1]))
+        else:
+            ini = fim = anos_inq[0]
+        anos_inq = [a for a in anos_inq if ini <= a <= fim]
+        # strata under 10 inquiries are left out: their curves are mostly noise
+        # same semantics as category_filters: no violence type selected means no restriction
+        tipos_inq = category_filters(anos_selecionados, tipos_sel)["TIPOVIOLENCIA"]
+        curvas, resumo = load_survival(DB_PATH, versao, ESTRATOS[rotulo], tipos_inq and sorted(tipos_inq), anos_inq, 10)
+
+        def km_panel():
+            if resumo.empty:
+                return "Nenhum estrato com inquéritos suficientes para os filtros selecionados."
+            from src.charts import sobrevivencia
+            return sobrevivencia.figure(curvas, rotulo), (
+                "Kaplan–Meier: fração dos inquéritos ainda não remetidos após N dias. Inquéritos sem remessa "
+                "na data do extrato entram como censurados; tipos de violência da barra lateral.")
+
+        figura("sobrevida", {"estrato": rotulo, "anos_inq": anos_inq}, km_panel)
+        if not resumo.empty:
+            st.dataframe(resumo.rename(columns={"estrato": rotulo, "mediana_dias": "mediana (dias)"}),
+                         hide_index=True, use_container_width=True)
+
+    st.markdown("---")
+    total_filtrado = int(cat_df["Quantidade"].sum())
+    st.metric("Casos no Filtro (aplica todos filtros)", f"{total_filtrado:,}")